@@ -22,7 +22,8 @@ try:
     else:
         print(f"[OK] File exists. Size: {os.path.getsize(abs_path)} bytes")
         
-        conn = sqlite3.connect(abs_path)
+        # Inspect read-only so this check never takes a write lock on the live DB
+        conn = sqlite3.connect(f"{Path(abs_path).as_uri()}?mode=ro&cache=shared", uri=True)
         cursor = conn.cursor()
         cursor.execute("SELECT name FROM sqlite_master WHERE type='table';")
         tables = [t[0] for t in cursor.fetchall()]
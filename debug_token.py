@@ -1,11 +1,16 @@
 import os
-from dotenv import load_dotenv
+from functools import lru_cache
+from dotenv import dotenv_values
 from github import Github, GithubException
 
-# Load environment explicitly
-load_dotenv()
 
-token = os.getenv("GITHUB_TOKEN")
+@lru_cache(maxsize=1)
+def _env():
+    """Parse .env once; real environment variables still take precedence."""
+    return dotenv_values(".env")
+
+
+token = os.getenv("GITHUB_TOKEN") or _env().get("GITHUB_TOKEN")
 if not token:
     print("❌ ERROR: GITHUB_TOKEN not found in environment variables.")
     exit(1)
@@ -199,14 +199,8 @@ def schedule(
     try:
         from src.automation.scheduler import DailyScheduler
         
-        scheduler = DailyScheduler()
-        
         # Override config if CLI args provided
-        if time:
-            scheduler.config.scheduling.time = time
-        if randomization is not None:
-            scheduler.config.scheduling.time_randomization_minutes = randomization
-            
+        scheduler = DailyScheduler(time=time, randomization_minutes=randomization)
         scheduler.start()
         
     except Exception as e:
@@ -4,10 +4,13 @@ Handles local Git operations and GitHub remote integration.
 """
 
 import os
+import re
 import random
+import subprocess
 from pathlib import Path
-from typing import List, Optional
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterator, List, Optional, Tuple
+from datetime import datetime, timezone
 import git
 from github import Github, GithubException
 from rich.console import Console
@@ -16,6 +19,25 @@ from src.database import Project, Commit
 
 console = Console()
 
+# Path fragments used to bucket generated files into commit groups
+_TEST_RE = re.compile(r"test")
+_CATEGORY_RE = re.compile(r"readme|requirements|license|config|\.gitignore|changelog")
+
+# Commit group -> (keywords matched against planned messages, fallback message)
+_COMMIT_MESSAGE_RULES = {
+    "chore": (("chore", "init"), "chore: initial project structure"),
+    "feat": (("feat",), "feat: implement core functionality"),
+    "refactor": (("refactor", "fix"), "refactor: optimize implementation"),
+    "test": (("test",), "test: add unit tests"),
+}
+
+# Directories never walked when collecting files to commit: git metadata and
+# the paths the generated .gitignore excludes anyway
+_PRUNED_DIRS = frozenset({"__pycache__", "venv", ".venv"})
+
+# Groups at least this large are staged via git plumbing in two subprocesses
+_PLUMBING_STAGE_THRESHOLD = 50
+
 class GitManager:
     """Manages Git repositories and GitHub interactions."""
     
@@ -28,10 +50,19 @@ class GitManager:
         """
         self.config = config
         self.github_client = None
+        self._user = None
+        self._remote_repos = {}
         
         if config.github.token and config.github.token != "${GITHUB_TOKEN}":
             self.github_client = Github(config.github.token)
     
+    @property
+    def _user_cached(self):
+        """Authenticated GitHub user, fetched from /user once per manager."""
+        if self._user is None:
+            self._user = self.github_client.get_user()
+        return self._user
+    
     def initialize_repo(self, project_dir: Path, project: Project) -> git.Repo:
         """
         Initialize a new local Git repository.
@@ -76,9 +107,6 @@ class GitManager:
         """
         created_commits = []
         
-        # Stage all files
-        repo.git.add(A=True)
-        
         # If we have multiple commits planned, we might want to simulate progressive work.
         # However, since CodeGenerator creates all files at once, we can't easily split "real" file states.
         # Strategy:
@@ -98,26 +126,41 @@ class GitManager:
         # Commit 2: Code (src/, main.py)
         # Commit 3: Tests (tests/)
         
-        files_to_commit = [f for f in project_dir.rglob("*") if f.is_file() and not f.name.startswith(".git")]
-        
-        # Reset everything first to stage selectively
-        repo.git.reset()
+        # Nothing is staged up front: each group is staged selectively below,
+        # and repo.index.commit only records what is in the index.
         
-        # Categorize files
+        # Categorize files as the walk yields them (no intermediate file list)
         config_docs = []
         source_code = []
         tests = []
         
-        for file_path in files_to_commit:
-            rel_path = file_path.relative_to(project_dir)
-            path_str = str(rel_path).lower()
-            
-            if "test" in path_str:
-                tests.append(str(rel_path))
-            elif any(x in path_str for x in ["readme", "requirements", "license", "config", ".gitignore", "changelog"]):
-                config_docs.append(str(rel_path))
+        for rel_path, path_str in _walk_rel(project_dir):
+            if _TEST_RE.search(path_str):
+                tests.append(rel_path)
+            elif _CATEGORY_RE.search(path_str):
+                config_docs.append(rel_path)
             else:
-                source_code.append(str(rel_path))
+                source_code.append(rel_path)
+        
+        # Nothing to commit: skip message resolution and grouping entirely
+        if not (config_docs or source_code or tests):
+            return created_commits
+        
+        # Walk order is filesystem-dependent; sort once so commit boundaries
+        # (e.g. the source_code split below) are deterministic and index
+        # entries arrive already in git's path order
+        config_docs.sort()
+        source_code.sort()
+        tests.sort()
+        
+        # Resolve the message for each group with a single pass over the plan
+        messages = {}
+        for m in commits_plan or ():
+            for group_type, (keywords, _) in _COMMIT_MESSAGE_RULES.items():
+                if group_type not in messages and any(k in m for k in keywords):
+                    messages[group_type] = m
+        for group_type, (_, default) in _COMMIT_MESSAGE_RULES.items():
+            messages.setdefault(group_type, default)
         
         commit_groups = []
         
@@ -128,7 +171,7 @@ class GitManager:
             if config_docs:
                 commit_groups.append({
                     "files": config_docs,
-                    "msg": next((m for m in commits_plan if "chore" in m or "init" in m), "chore: initial project structure")
+                    "msg": messages["chore"]
                 })
             
             # Group 2: Core Logic (Split source code)
@@ -138,23 +181,23 @@ class GitManager:
                 if mid > 0:
                     commit_groups.append({
                         "files": source_code[:mid],
-                        "msg": next((m for m in commits_plan if "feat" in m), "feat: implement core functionality")
+                        "msg": messages["feat"]
                     })
                     commit_groups.append({
                         "files": source_code[mid:],
-                        "msg": next((m for m in commits_plan if "refactor" in m or "fix" in m), "refactor: optimize implementation")
+                        "msg": messages["refactor"]
                     })
                 else:
                     commit_groups.append({
                         "files": source_code,
-                        "msg": next((m for m in commits_plan if "feat" in m), "feat: implement core functionality")
+                        "msg": messages["feat"]
                     })
                 
             # Group 3: Tests
             if tests:
                 commit_groups.append({
                     "files": tests,
-                    "msg": next((m for m in commits_plan if "test" in m), "test: add unit tests")
+                    "msg": messages["test"]
                 })
 
         else:
@@ -163,30 +206,30 @@ class GitManager:
             if config_docs:
                 commit_groups.append({
                     "files": config_docs,
-                    "msg": next((m for m in commits_plan if "chore" in m or "init" in m), "chore: initial project structure")
+                    "msg": messages["chore"]
                 })
                 
             # Group 2: Source Code
             if source_code:
                 commit_groups.append({
                     "files": source_code,
-                    "msg": next((m for m in commits_plan if "feat" in m), "feat: implement core functionality")
+                    "msg": messages["feat"]
                 })
                 
             # Group 3: Tests
             if tests:
                 commit_groups.append({
                     "files": tests,
-                    "msg": next((m for m in commits_plan if "test" in m), "test: add unit tests")
+                    "msg": messages["test"]
                 })
             
-        # Execute commits
+        # Execute commits (one naive-UTC timestamp shared by every group)
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
         for group in commit_groups:
             if not group["files"]:
                 continue
                 
-            for f in group["files"]:
-                repo.git.add(f)
+            self._stage_files(repo, group["files"])
             
             # Commit
             try:
@@ -203,7 +246,7 @@ class GitManager:
                     files_changed=group["files"],
                     additions=stats_for_files(project_dir, group["files"]),  # Simplified
                     author_name=self.config.github.username,
-                    committed_at=datetime.utcnow()
+                    committed_at=now
                 )
                 created_commits.append(db_commit)
                 
@@ -212,47 +255,98 @@ class GitManager:
         
         return created_commits
 
-    def create_remote_repo(self, project: Project) -> Optional[str]:
+    def _stage_files(self, repo: git.Repo, files: List[str]):
+        """
+        Stage a group of files.
+        
+        Small groups go through GitPython's in-process index writer. Large groups
+        are hashed with one `git hash-object --stdin-paths` call and written to the
+        index with one `git update-index --index-info` call.
+        
+        Args:
+            repo: Git repo object
+            files: Paths relative to the repository root
+        """
+        if len(files) < _PLUMBING_STAGE_THRESHOLD:
+            repo.index.add(files)
+            return
+        
+        git_exe = repo.git.GIT_PYTHON_GIT_EXECUTABLE
+        work_dir = repo.working_tree_dir
+        hashed = subprocess.run(
+            [git_exe, "hash-object", "-w", "--stdin-paths"],
+            cwd=work_dir, input="\n".join(files) + "\n",
+            capture_output=True, text=True, check=True
+        )
+        
+        index_info = []
+        for rel_path, sha in zip(files, hashed.stdout.split()):
+            full_path = os.path.join(work_dir, rel_path)
+            mode = "100755" if os.name != "nt" and os.access(full_path, os.X_OK) else "100644"
+            index_info.append(f"{mode} {sha}\t{rel_path.replace(os.sep, '/')}")
+        
+        subprocess.run(
+            [git_exe, "update-index", "--add", "--index-info"],
+            cwd=work_dir, input="\n".join(index_info) + "\n",
+            capture_output=True, text=True, check=True
+        )
+
+    def create_remote_repo(self, title: str, description: str, private: bool = False) -> Optional[str]:
         """
         Create a remote GitHub repository.
         
+        Takes plain values rather than a Project so it can run off the thread
+        that owns the database session.
+        
         Args:
-            project: Project data
+            title: Project title (the repository name is derived from it)
+            description: Repository description
+            private: Create the repository as private
             
         Returns:
-            Clone URL of the new repo, or None if failed
+            Clone URL of the new (or already existing) repo, or None if failed
         """
         if not self.github_client:
             console.print("[yellow]GitHub token not configured. Skipping remote creation.[/yellow]")
             return None
             
+        # Sanitize name
+        repo_name = title.lower().replace(" ", "-").replace("_", "-")
+        
         try:
-            user = self.github_client.get_user()
+            user = self._user_cached
             
-            # Sanitize name
-            repo_name = project.title.lower().replace(" ", "-").replace("_", "-")
+            cached = self._remote_repos.get(repo_name)
+            if cached is not None:
+                return cached.clone_url
             
-            # Check if exists (optional, create_repo might fail)
-            # We'll just try to create it
-            
-            repo = user.create_repo(
-                name=repo_name,
-                description=project.description,
-                private=project.is_private,
-                has_issues=True,
-                has_wiki=False,
-                has_projects=False
-            )
+            # Probe with a cheap GET first so reruns reuse the repo instead of
+            # spending a POST that fails with 422
+            try:
+                repo = self.github_client.get_repo(f"{user.login}/{repo_name}")
+                console.print(f"[yellow]Repository {repo_name} already exists on GitHub, reusing it.[/yellow]")
+            except GithubException as e:
+                if e.status != 404:
+                    raise
+                repo = user.create_repo(
+                    name=repo_name,
+                    description=description,
+                    private=private,
+                    has_issues=True,
+                    has_wiki=False,
+                    has_projects=False
+                )
+                console.print(f"[green]Created remote repository:[/green] {repo.html_url}")
             
-            console.print(f"[green]Created remote repository:[/green] {repo.html_url}")
+            self._remote_repos[repo_name] = repo
             return repo.clone_url
             
         except GithubException as e:
-            if e.status == 422: # Already exists
-                console.print(f"[yellow]Repository {project.title} already exists on GitHub.[/yellow]")
-                # Try to get the existing URL? 
-                # For now return None to avoid overwriting or errors
-                return None
+            if e.status == 422: # Created since the probe above
+                console.print(f"[yellow]Repository {repo_name} already exists on GitHub, reusing it.[/yellow]")
+                repo = self.github_client.get_repo(f"{self._user_cached.login}/{repo_name}")
+                self._remote_repos[repo_name] = repo
+                return repo.clone_url
             else:
                 console.print(f"[red]GitHub API Error:[/red] {e}")
                 raise
@@ -281,12 +375,15 @@ class GitManager:
                 auth_url = remote_url.replace("https://", f"https://{self.config.github.token}@")
                 origin.set_url(auth_url)
                 
-            origin.push(refspec="master:master") # or main:main
-            # Handle default branch naming (main vs master)
-            # Usually 'master' in gitpython default init, but let's check
+            # Push only the active branch (main vs master depends on git's init default)
+            try:
+                current_branch = repo.active_branch.name
+            except TypeError:
+                # Detached HEAD: pin the current commit to a local 'main' branch once
+                repo.git.checkout("-B", "main")
+                current_branch = "main"
             
-            current_branch = repo.active_branch.name
-            origin.push(refspec=f"{current_branch}:{current_branch}")
+            origin.push(refspec=f"{current_branch}:{current_branch}", set_upstream=True)
             
             console.print("[green]Successfully pushed to GitHub![/green]")
             
@@ -295,12 +392,51 @@ class GitManager:
             raise
 
 
-def stats_for_files(base_path: Path, files: List[str]) -> int:
-    """Estimate lines of code for stats."""
+def _walk_rel(base_path: Path) -> Iterator[Tuple[str, str]]:
+    """
+    Lazily yield (relative path, lowercased relative path) for project files.
+    
+    Pruned directories (.git, virtualenvs, __pycache__) are never descended
+    into. Relative paths are sliced from plain strings,
+    so no Path or relpath work is done per file.
+    """
+    base_len = len(os.path.join(os.fspath(base_path), ""))
+    
+    for root, dirs, files in os.walk(base_path, followlinks=False):
+        # Only .git itself: .github/ and similar hold files that belong in the commits
+        dirs[:] = [d for d in dirs if d != ".git" and d not in _PRUNED_DIRS]
+        rel_root = os.path.join(root, "")[base_len:]
+        for name in files:
+            if name.startswith(".git"):
+                continue
+            rel_path = rel_root + name
+            yield rel_path, rel_path.lower()
+
+
+def _count_lines(path: Path) -> int:
+    """Count lines in a file without decoding it."""
     count = 0
-    for f in files:
-        try:
-            count += len((base_path / f).read_text(encoding='utf-8', errors='ignore').splitlines())
-        except:
-            pass
+    last = b"\n"
+    with open(path, "rb") as fh:
+        for chunk in iter(lambda: fh.read(65536), b""):
+            count += chunk.count(b"\n")
+            last = chunk[-1:]
+    # Match str.splitlines(): a final line without a trailing newline still counts
+    if last != b"\n":
+        count += 1
     return count
+
+
+def _safe_count_lines(path: Path) -> int:
+    try:
+        return _count_lines(path)
+    except OSError:
+        return 0
+
+
+def stats_for_files(base_path: Path, files: List[str]) -> int:
+    """Estimate lines of code for stats (files are read concurrently)."""
+    if not files:
+        return 0
+    with ThreadPoolExecutor(max_workers=min(8, len(files))) as executor:
+        return sum(executor.map(_safe_count_lines, (base_path / f for f in files)))
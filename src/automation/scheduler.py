@@ -3,8 +3,6 @@ Daily Scheduler
 Orchestrates automated daily execution with randomization and error handling.
 """
 
-import time
-import random
 import logging
 from datetime import datetime, timedelta
 from typing import Optional
@@ -26,31 +24,59 @@ logger = logging.getLogger(__name__)
 class DailyScheduler:
     """Manages scheduled execution of the workflow."""
     
-    def __init__(self):
-        """Initialize scheduler."""
+    def __init__(self, time: Optional[str] = None, randomization_minutes: Optional[int] = None):
+        """
+        Initialize scheduler.
+        
+        Args:
+            time: Override for the configured "HH:MM" schedule time
+            randomization_minutes: Override for the configured randomization window
+        """
         self.scheduler = BlockingScheduler()
         self.config_manager = get_config_manager()
         self.config_manager.load_config()
         self.config = self.config_manager.config
         self.workflow_engine = WorkflowEngine(dry_run=False)  # Usually for production
+        
+        # Resolve schedule settings once; the job reads these plain attributes
+        scheduling = self.config.scheduling
+        overrides = {}
+        if time:
+            overrides["time"] = time
+        if randomization_minutes is not None:
+            overrides["time_randomization_minutes"] = randomization_minutes
+        if overrides:
+            # Config models are frozen; apply CLI overrides to a copy
+            scheduling = scheduling.model_copy(update=overrides)
+        self.scheduling = scheduling
+        self._schedule_time = scheduling.time
+        self._hour, self._minute = map(int, scheduling.time.split(':'))
+        self._timezone = scheduling.timezone
+        self._random_minutes = scheduling.time_randomization_minutes
+        self._skip_weekends = scheduling.skip_weekends
+        self._max_retries = scheduling.max_retries if scheduling.retry_on_failure else 0
     
     def start(self):
         """Start the scheduler."""
-        if not self.config.scheduling.enabled:
+        if not self.scheduling.enabled:
             console.print("[yellow]Scheduling is disabled in configuration.[/yellow]")
             return
 
-        schedule_time = self.config.scheduling.time
-        hour, minute = map(int, schedule_time.split(':'))
-        
         console.print(f"[green]Starting Daily Scheduler[/green]")
-        console.print(f"Scheduled time: {schedule_time} ({self.config.scheduling.timezone})")
-        console.print(f"Randomization: ±{self.config.scheduling.time_randomization_minutes} minutes")
+        console.print(f"Scheduled time: {self._schedule_time} ({self._timezone})")
+        console.print(f"Randomization: up to {self._random_minutes} minutes after the scheduled time")
         
-        # Schedule the daily job
+        # Schedule the daily job. Randomization is applied by the trigger itself
+        # (CronTrigger jitter delays each run by 0 to N minutes), so no worker sleeps.
+        jitter_seconds = self._random_minutes * 60
         self.scheduler.add_job(
             self._scheduled_job,
-            CronTrigger(hour=hour, minute=minute, timezone=self.config.scheduling.timezone),
+            CronTrigger(
+                hour=self._hour,
+                minute=self._minute,
+                timezone=self._timezone,
+                jitter=jitter_seconds or None
+            ),
             id='daily_workflow',
             name='Daily Git Activity Workflow',
             replace_existing=True
@@ -66,67 +92,54 @@ class DailyScheduler:
         """The job that runs daily at the scheduled time."""
         logger.info("Triggered scheduled job")
         
-        # 1. Randomization Delay
-        random_minutes = self.config.scheduling.time_randomization_minutes
-        if random_minutes > 0:
-            # Randomize +/- random_minutes
-            delay_minutes = random.randint(-random_minutes, random_minutes)
-            delay_seconds = delay_minutes * 60
-            
-            # If delay is negative, we can't go back in time, so we just run now?
-            # Actually, standard randomization is usually + delay. 
-            # If we want +/- around a target time, we need to schedule specifically.
-            # But here, we are triggered AT the target time.
-            # So, we can only delay (wait).
-            # To achieve +/- effect, the schedule time should be the earliest possible start, 
-            # and we delay by random(0, window).
-            #
-            # Let's interpret "time_randomization_minutes" as a random delay added to start.
-            # Or if user wants +/- around 9am, they should set schedule to 7am and random delay up to 4 hours?
-            # Let's keep it simple: We delay by a random amount [0, 2 * random_minutes] ?
-            #
-            # The config says "±2 hours". This implies the user expects 9am +/- 2h.
-            # But cron fires at 9am. We can't fire at 7am.
-            # Solution: We run immediately, but wait a random delay? No, that blocks the thread.
-            # Ideally: Schedule logic should define the window. 
-            
-            # Simplified approach: Just delay by 0 to random_minutes minutes.
-            # Authenticity is mostly about not running at exact 09:00:00 every day.
-            
-            actual_delay = random.randint(0, random_minutes * 60)
-            logger.info(f"Waiting {actual_delay} seconds for authenticity...")
-            time.sleep(actual_delay)
-        
-        # 2. Skip Weekends if configured
-        if self.config.scheduling.skip_weekends:
+        # 1. Skip Weekends if configured
+        if self._skip_weekends:
             if datetime.now().weekday() >= 5:  # 5=Saturday, 6=Sunday
                 logger.info("Skipping weekend execution.")
                 return
 
-        # 3. Execution with Retry
-        max_retries = self.config.scheduling.max_retries if self.config.scheduling.retry_on_failure else 0
-        retries = 0
+        # 2. Execution (retries are rescheduled, see _run_attempt)
+        self._run_attempt(retries=0)
+    
+    def _run_attempt(self, retries: int = 0):
+        """
+        Run one workflow attempt.
         
-        while retries <= max_retries:
-            try:
-                console.print(f"\n[bold cyan]Executing Daily Workflow ({datetime.now()})[/bold cyan]")
-                project = self.workflow_engine.run_daily_workflow()
-                
-                if project:
-                    logger.info(f"Workflow completed successfully: Project {project.id}")
-                    break
-                else:
-                    logger.warning("Workflow returned None (failure?)")
-                    raise Exception("Workflow failed to generate project")
-                    
-            except Exception as e:
-                retries += 1
-                logger.error(f"Workflow failed (Attempt {retries}/{max_retries + 1}): {e}")
+        On failure, the next attempt is added as a one-off 'date' job instead of
+        sleeping, so the scheduler worker is released between attempts.
+        
+        Args:
+            retries: Number of attempts that have already failed today
+        """
+        max_retries = self._max_retries
+        
+        try:
+            console.print(f"\n[bold cyan]Executing Daily Workflow ({datetime.now()})[/bold cyan]")
+            project = self.workflow_engine.run_daily_workflow()
+            
+            if project:
+                logger.info(f"Workflow completed successfully: Project {project.id}")
+                return
+            else:
+                logger.warning("Workflow returned None (failure?)")
+                raise Exception("Workflow failed to generate project")
                 
-                if retries <= max_retries:
-                    wait_time = 60 * 5 * retries  # Linear backoff: 5, 10, 15 mins
-                    logger.info(f"Retrying in {wait_time} seconds...")
-                    time.sleep(wait_time)
-                else:
-                    logger.error("Max retries reached. Giving up for today.")
-                    # TODO: Send notification failure
+        except Exception as e:
+            retries += 1
+            logger.error(f"Workflow failed (Attempt {retries}/{max_retries + 1}): {e}")
+            
+            if retries <= max_retries:
+                wait_time = 60 * 5 * retries  # Linear backoff: 5, 10, 15 mins
+                logger.info(f"Retrying in {wait_time} seconds...")
+                self.scheduler.add_job(
+                    self._run_attempt,
+                    'date',
+                    run_date=datetime.now() + timedelta(seconds=wait_time),
+                    kwargs={'retries': retries},
+                    id='daily_workflow_retry',
+                    name='Daily Git Activity Workflow (retry)',
+                    replace_existing=True
+                )
+            else:
+                logger.error("Max retries reached. Giving up for today.")
+                # TODO: Send notification failure
@@ -4,28 +4,135 @@ Handles loading, validation, and access to system configuration.
 """
 
 import os
+import re
+import copy
+import json
+from collections import OrderedDict
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Literal, Optional, Tuple
 import yaml
-from pydantic import BaseModel, Field, validator
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter, validator
 from pydantic_settings import BaseSettings
 from dotenv import load_dotenv
 
+try:
+    # libyaml-backed loader; fall back to the pure-Python one when unavailable
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
 
-class GitHubConfig(BaseModel):
+
+# Parsed YAML keyed by absolute path -> (mtime_ns, size, raw config)
+_YAML_CACHE: "OrderedDict[str, Tuple[int, int, Any]]" = OrderedDict()
+_YAML_CACHE_MAX_ENTRIES = 100
+
+
+def _sidecar_path(path: Path) -> Path:
+    """JSON copy of a YAML file, stored next to it (e.g. config.yaml.json)."""
+    return path.with_name(path.name + ".json")
+
+
+def _read_json_sidecar(path: Path, stat: os.stat_result) -> Any:
+    """
+    Load the JSON sidecar for a YAML file if it was built from the current file.
+    
+    Returns:
+        The parsed document, or None if the sidecar is missing or stale
+    """
+    try:
+        with open(_sidecar_path(path), 'r', encoding='utf-8') as f:
+            sidecar = json.load(f)
+    except (OSError, ValueError):
+        return None
+    
+    if not isinstance(sidecar, dict):
+        return None
+    if sidecar.get("source_mtime_ns") != stat.st_mtime_ns or sidecar.get("source_size") != stat.st_size:
+        return None
+    return sidecar.get("data")
+
+
+def _write_json_sidecar(path: Path, stat: os.stat_result, raw: Any):
+    """
+    Persist a parsed YAML document as JSON so later processes skip YAML parsing.
+    
+    Skipped unless JSON reproduces the document exactly (non-string keys or
+    dates would come back changed). Written to a temp file and renamed into
+    place, so readers never see a partial sidecar.
+    """
+    sidecar = {"source_mtime_ns": stat.st_mtime_ns, "source_size": stat.st_size, "data": raw}
+    try:
+        text = json.dumps(sidecar)
+        if json.loads(text)["data"] != raw:
+            return
+    except (TypeError, ValueError):
+        return
+    
+    target = _sidecar_path(path)
+    tmp = target.with_name(f"{target.name}.{os.getpid()}.tmp")
+    try:
+        with open(tmp, 'w', encoding='utf-8') as f:
+            f.write(text)
+        os.replace(tmp, target)
+    except OSError:
+        # Best effort: read-only directories just skip the sidecar
+        try:
+            tmp.unlink()
+        except OSError:
+            pass
+
+
+def _read_yaml_cached(path: Path) -> Any:
+    """
+    Parse a YAML file, reusing the previous parse while mtime and size are unchanged.
+    
+    Args:
+        path: Path to the YAML file
+        
+    Returns:
+        A private deep copy of the parsed document (callers may mutate it)
+    """
+    key = str(path.resolve())
+    stat = path.stat()
+    
+    cached = _YAML_CACHE.get(key)
+    if cached is not None and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+        _YAML_CACHE.move_to_end(key)
+        return copy.deepcopy(cached[2])
+    
+    raw = _read_json_sidecar(path, stat)
+    if raw is None:
+        with open(path, 'r', encoding='utf-8') as f:
+            raw = yaml.load(f, Loader=_YamlLoader)
+        _write_json_sidecar(path, stat, raw)
+    
+    _YAML_CACHE[key] = (stat.st_mtime_ns, stat.st_size, raw)
+    _YAML_CACHE.move_to_end(key)
+    if len(_YAML_CACHE) > _YAML_CACHE_MAX_ENTRIES:
+        _YAML_CACHE.popitem(last=False)
+    return copy.deepcopy(raw)
+
+
+class _ConfigModel(BaseModel):
+    """Base for configuration sections: immutable once loaded, unknown keys rejected."""
+    model_config = ConfigDict(frozen=True, extra="forbid")
+
+
+class GitHubConfig(_ConfigModel):
     """GitHub configuration settings."""
     username: str
     token: str
-    repository_strategy: str = Field(default="separate", pattern="^(separate|monorepo)$")
-    default_visibility: str = Field(default="public", pattern="^(public|private)$")
+    repository_strategy: Literal["separate", "monorepo"] = "separate"
+    default_visibility: Literal["public", "private"] = "public"
     repository_prefix: str = "auto-"
     use_topics: bool = True
     create_issues: bool = False
 
 
-class AIConfig(BaseModel):
+class AIConfig(_ConfigModel):
     """AI/LLM configuration settings."""
-    provider: str = Field(pattern="^(openai|ollama)$")
+    provider: Literal["openai", "ollama"]
     model: str
     api_key: Optional[str] = None
     temperature: float = Field(default=0.7, ge=0.0, le=1.0)
@@ -33,7 +140,7 @@ class AIConfig(BaseModel):
     timeout: int = Field(default=60, ge=10, le=300)
 
 
-class SkillsConfig(BaseModel):
+class SkillsConfig(_ConfigModel):
     """Skills tracking and progression configuration."""
     focus_areas: Dict[str, int]
     progression: Dict[str, Any]
@@ -47,7 +154,7 @@ class SkillsConfig(BaseModel):
         return v
 
 
-class SchedulingConfig(BaseModel):
+class SchedulingConfig(_ConfigModel):
     """Task scheduling configuration."""
     enabled: bool = True
     time: str
@@ -58,17 +165,17 @@ class SchedulingConfig(BaseModel):
     max_retries: int = Field(default=3, ge=1, le=10)
 
 
-class AutomationConfig(BaseModel):
+class AutomationConfig(_ConfigModel):
     """Automation behavior configuration."""
-    mode: str = Field(pattern="^(auto|review|manual)$")
-    commit_strategy: str = Field(pattern="^(single|smart|detailed)$")
+    mode: Literal["auto", "review", "manual"]
+    commit_strategy: Literal["single", "smart", "detailed"]
     push_immediately: bool = True
     create_branch: bool = False
     auto_merge: bool = False
     delete_branch_after_merge: bool = True
 
 
-class QualityConfig(BaseModel):
+class QualityConfig(_ConfigModel):
     """Code quality requirements configuration."""
     min_lines_of_code: int = Field(default=100, ge=10)
     require_readme: bool = True
@@ -80,7 +187,7 @@ class QualityConfig(BaseModel):
     run_linters: bool = True
 
 
-class NotificationsConfig(BaseModel):
+class NotificationsConfig(_ConfigModel):
     """Notifications configuration."""
     enabled: bool = False
     email: Optional[str] = None
@@ -90,15 +197,15 @@ class NotificationsConfig(BaseModel):
     notification_time: str = "20:00"
 
 
-class DatabaseConfig(BaseModel):
+class DatabaseConfig(_ConfigModel):
     """Database configuration."""
     path: str = "data/activity_tracker.db"
     backup_enabled: bool = True
-    backup_frequency: str = Field(pattern="^(daily|weekly|monthly)$")
+    backup_frequency: Literal["daily", "weekly", "monthly"]
     backup_path: str = "data/backups/"
 
 
-class ProjectsConfig(BaseModel):
+class ProjectsConfig(_ConfigModel):
     """Project generation configuration."""
     output_directory: str = "generated_projects"
     keep_local_copies: bool = True
@@ -106,22 +213,22 @@ class ProjectsConfig(BaseModel):
     project_lifetime_days: int = Field(default=7, ge=1, le=30)
 
 
-class DiversityConfig(BaseModel):
+class DiversityConfig(_ConfigModel):
     """Project diversity configuration."""
     prevent_same_tech_consecutive: bool = True
     prevent_same_category_consecutive: bool = True
     rotation_cycle_days: int = Field(default=7, ge=3, le=30)
 
 
-class LoggingConfig(BaseModel):
+class LoggingConfig(_ConfigModel):
     """Logging configuration."""
-    level: str = Field(default="INFO", pattern="^(DEBUG|INFO|WARNING|ERROR)$")
+    level: Literal["DEBUG", "INFO", "WARNING", "ERROR"] = "INFO"
     file_path: str = "data/logs/activity_generator.log"
     console_output: bool = True
     rich_formatting: bool = True
 
 
-class SystemConfig(BaseModel):
+class SystemConfig(_ConfigModel):
     """Complete system configuration."""
     github: GitHubConfig
     ai: AIConfig
@@ -136,6 +243,25 @@ class SystemConfig(BaseModel):
     logging: LoggingConfig
 
 
+@lru_cache(maxsize=None)
+def _ensure_env_loaded():
+    """Load environment variables from the .env file (once per process)."""
+    env_path = Path(".env")
+    if env_path.exists():
+        load_dotenv(env_path)
+
+
+# Compiled once; validates straight into the core schema on every load
+_SYSTEM_CONFIG_ADAPTER = TypeAdapter(SystemConfig)
+
+# ${VAR_NAME} placeholders in configuration strings
+_ENV_VAR_RE = re.compile(r"\$\{([^}]+)\}")
+
+# Sentinels for ConfigManager.get's path cache
+_MISSING = object()
+_NOT_FOUND = object()
+
+
 class ConfigManager:
     """Manages system configuration loading and access."""
     
@@ -148,17 +274,16 @@ class ConfigManager:
         """
         self.config_path = Path(config_path)
         self._config: Optional[SystemConfig] = None
-        self._load_environment()
-        
-    def _load_environment(self):
-        """Load environment variables from .env file."""
-        env_path = Path(".env")
-        if env_path.exists():
-            load_dotenv(env_path)
+        # Resolved dot-paths for the current config (reset on every load)
+        self._get_cache: Dict[str, Any] = {}
+        _ensure_env_loaded()
     
     def _substitute_env_vars(self, data: Any) -> Any:
         """
-        Recursively substitute environment variables in configuration.
+        Substitute environment variables in configuration.
+        
+        Walks the tree iteratively with an explicit stack and replaces
+        placeholders in place (the caller owns a private copy of the data).
         
         Args:
             data: Configuration data (dict, list, or primitive)
@@ -166,18 +291,37 @@ class ConfigManager:
         Returns:
             Data with environment variables substituted
         """
-        if isinstance(data, dict):
-            return {k: self._substitute_env_vars(v) for k, v in data.items()}
-        elif isinstance(data, list):
-            return [self._substitute_env_vars(item) for item in data]
-        elif isinstance(data, str):
-            # Replace ${VAR_NAME} with environment variable value
-            if data.startswith("${") and data.endswith("}"):
-                var_name = data[2:-1]
-                return os.getenv(var_name, data)
-            return data
-        else:
+        # Each distinct variable is read from the environment once per pass
+        env_cache: Dict[str, Optional[str]] = {}
+        
+        def lookup(match: "re.Match[str]") -> str:
+            var_name = match.group(1)
+            if var_name not in env_cache:
+                env_cache[var_name] = os.environ.get(var_name)
+            value = env_cache[var_name]
+            return match.group(0) if value is None else value
+        
+        def substitute(value: str) -> str:
+            # Replace ${VAR_NAME} (anywhere in the string) with the environment variable value
+            if "${" not in value:
+                return value
+            return _ENV_VAR_RE.sub(lookup, value)
+        
+        if isinstance(data, str):
+            return substitute(data)
+        if not isinstance(data, (dict, list)):
             return data
+        
+        stack = [data]
+        while stack:
+            node = stack.pop()
+            items = node.items() if isinstance(node, dict) else enumerate(node)
+            for key, value in items:
+                if isinstance(value, str):
+                    node[key] = substitute(value)
+                elif isinstance(value, (dict, list)):
+                    stack.append(value)
+        return data
     
     def load_config(self) -> SystemConfig:
         """
@@ -193,9 +337,8 @@ class ConfigManager:
         if not self.config_path.exists():
             raise FileNotFoundError(f"Configuration file not found: {self.config_path}")
         
-        # Load YAML file
-        with open(self.config_path, 'r', encoding='utf-8') as f:
-            raw_config = yaml.safe_load(f)
+        # Load YAML file (re-parsed only when the file changes)
+        raw_config = _read_yaml_cached(self.config_path)
         
         # Substitute environment variables
         config_data = self._substitute_env_vars(raw_config)
@@ -208,7 +351,8 @@ class ConfigManager:
         
         # Validate and create config object
         try:
-            self._config = SystemConfig(**config_data)
+            self._config = _SYSTEM_CONFIG_ADAPTER.validate_python(config_data)
+            self._get_cache = {}
             return self._config
         except Exception as e:
             raise ValueError(f"Invalid configuration: {e}")
@@ -243,6 +387,10 @@ class ConfigManager:
             >>> config_manager.get("ai.model")
             "gpt-4"
         """
+        cached = self._get_cache.get(key_path, _MISSING)
+        if cached is not _MISSING:
+            return default if cached is _NOT_FOUND else cached
+        
         try:
             value = self.config
             for key in key_path.split('.'):
@@ -251,10 +399,13 @@ class ConfigManager:
                 elif isinstance(value, dict) and key in value:
                     value = value[key]
                 else:
-                    return default
-            return value
+                    value = _NOT_FOUND
+                    break
         except Exception:
             return default
+        
+        self._get_cache[key_path] = value
+        return default if value is _NOT_FOUND else value
     
     def validate_required_env_vars(self) -> bool:
         """
@@ -298,30 +449,33 @@ class ConfigManager:
             self.config.projects.output_directory,
         ]
         
+        # Resolve each entry to the directory it needs (parent for file paths)
+        targets = set()
         for path_str in directories:
             path = Path(path_str)
-            # If it's a file path, create parent directory
-            if '.' in path.name:
-                path.parent.mkdir(parents=True, exist_ok=True)
-            else:
-                path.mkdir(parents=True, exist_ok=True)
-
-
-# Singleton instance
-_config_manager_instance: Optional[ConfigManager] = None
+            targets.add(path.parent if path.suffix else path)
+        
+        # mkdir(parents=True) on a child already creates its ancestors
+        covered = {parent for target in targets for parent in target.parents}
+        for directory in targets - covered:
+            directory.mkdir(parents=True, exist_ok=True)
 
 
 def get_config_manager(config_path: str = "config.yaml") -> ConfigManager:
     """
-    Get the singleton ConfigManager instance.
+    Get the shared ConfigManager instance for a configuration file.
     
     Args:
-        config_path: Path to configuration file (only used on first call)
+        config_path: Path to configuration file (one instance per resolved path)
         
     Returns:
         ConfigManager: The configuration manager instance
     """
-    global _config_manager_instance
-    if _config_manager_instance is None:
-        _config_manager_instance = ConfigManager(config_path)
-    return _config_manager_instance
+    # "config.yaml", "./config.yaml" and the absolute path share one instance
+    return _config_manager_for(str(Path(config_path).resolve()))
+
+
+@lru_cache(maxsize=None)
+def _config_manager_for(resolved_path: str) -> ConfigManager:
+    """Build the ConfigManager for an already-resolved configuration path."""
+    return ConfigManager(resolved_path)
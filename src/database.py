@@ -4,17 +4,20 @@ SQLAlchemy models for tracking projects, skills, commits, and daily activity.
 """
 
 from datetime import datetime
-from typing import List, Optional
+from functools import cached_property, lru_cache
+from typing import Any, Dict, List, Optional, Tuple
 from sqlalchemy import (
-    create_engine, Column, Integer, String, Float, Boolean, 
+    create_engine, event, func, select, Index, UniqueConstraint, Integer, String, Float, Boolean, 
     DateTime, Text, ForeignKey, JSON, Enum as SQLEnum
 )
-from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import relationship, sessionmaker, Session
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship, sessionmaker, undefer, Session
 from enum import Enum
 
 
-Base = declarative_base()
+class Base(DeclarativeBase):
+    """Declarative base for all models (SQLAlchemy 2.0 typed mappings)."""
 
 
 class DifficultyLevel(str, Enum):
@@ -40,46 +43,66 @@ class ProjectStatus(str, Enum):
     FAILED = "failed"
 
 
+def _enum_column_type(enum_class):
+    """
+    VARCHAR + CHECK constraint storage for a Python enum.
+    
+    Avoids backend-native ENUM types while keeping enum members on the Python
+    side; values are stored by member name, as in existing databases.
+    """
+    return SQLEnum(
+        enum_class,
+        native_enum=False,
+        create_constraint=True,
+        name=f"ck_{enum_class.__name__.lower()}"
+    )
+
+
 class Project(Base):
     """Tracks generated projects and their metadata."""
     __tablename__ = "projects"
+    __table_args__ = (
+        Index("ix_projects_status_category", "status", "category"),
+        Index("ix_projects_created_at", "created_at"),
+    )
     
-    id = Column(Integer, primary_key=True, autoincrement=True)
-    title = Column(String(200), nullable=False)
-    description = Column(Text, nullable=False)
-    category = Column(SQLEnum(ProjectCategory), nullable=False)
-    difficulty = Column(SQLEnum(DifficultyLevel), nullable=False)
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    title: Mapped[str] = mapped_column(String(200), nullable=False)
+    description: Mapped[str] = mapped_column(Text, nullable=False)
+    category: Mapped[ProjectCategory] = mapped_column(_enum_column_type(ProjectCategory), nullable=False)
+    difficulty: Mapped[DifficultyLevel] = mapped_column(_enum_column_type(DifficultyLevel), nullable=False)
     
     # Technology stack
-    technologies = Column(JSON, default=list)  # List of technologies used
-    primary_language = Column(String(50))
+    technologies: Mapped[Optional[List[str]]] = mapped_column(JSON, default=list)  # List of technologies used (mirrored in project_technologies)
+    primary_language: Mapped[Optional[str]] = mapped_column(String(50))
     
     # GitHub information
-    repository_name = Column(String(200), unique=True)
-    repository_url = Column(String(500))
-    is_private = Column(Boolean, default=False)
+    repository_name: Mapped[Optional[str]] = mapped_column(String(200), unique=True)
+    repository_url: Mapped[Optional[str]] = mapped_column(String(500))
+    is_private: Mapped[Optional[bool]] = mapped_column(Boolean, default=False)
     
     # Project status
-    status = Column(SQLEnum(ProjectStatus), default=ProjectStatus.PLANNED)
+    status: Mapped[Optional[ProjectStatus]] = mapped_column(_enum_column_type(ProjectStatus), default=ProjectStatus.PLANNED)
     
     # File structure
-    file_structure = Column(JSON, default=dict)  # Dictionary of file paths and purposes
-    lines_of_code = Column(Integer, default=0)
+    file_structure: Mapped[Optional[Dict[str, Any]]] = mapped_column(JSON, default=dict, deferred=True)  # Dictionary of file paths and purposes (loaded on access)
+    lines_of_code: Mapped[Optional[int]] = mapped_column(Integer, default=0)
     
     # Quality metrics
-    has_readme = Column(Boolean, default=False)
-    has_tests = Column(Boolean, default=False)
-    documentation_coverage = Column(Float, default=0.0)  # Percentage
-    code_quality_score = Column(Float, default=0.0)  # 0-100
+    has_readme: Mapped[Optional[bool]] = mapped_column(Boolean, default=False)
+    has_tests: Mapped[Optional[bool]] = mapped_column(Boolean, default=False)
+    documentation_coverage: Mapped[Optional[float]] = mapped_column(Float, default=0.0)  # Percentage
+    code_quality_score: Mapped[Optional[float]] = mapped_column(Float, default=0.0)  # 0-100
     
     # Timestamps
-    created_at = Column(DateTime, default=datetime.utcnow)
-    started_at = Column(DateTime, nullable=True)
-    completed_at = Column(DateTime, nullable=True)
+    created_at: Mapped[Optional[datetime]] = mapped_column(DateTime, default=func.now(), server_default=func.now())
+    started_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+    completed_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
     
     # Relationships
-    commits = relationship("Commit", back_populates="project", cascade="all, delete-orphan")
-    project_skills = relationship("ProjectSkill", back_populates="project", cascade="all, delete-orphan")
+    commits: Mapped[List["Commit"]] = relationship("Commit", back_populates="project", cascade="all, delete-orphan")
+    project_skills: Mapped[List["ProjectSkill"]] = relationship("ProjectSkill", back_populates="project", cascade="all, delete-orphan")
+    technology_links: Mapped[List["ProjectTechnology"]] = relationship("ProjectTechnology", back_populates="project", cascade="all, delete-orphan")
     
     def __repr__(self):
         return f"<Project(id={self.id}, title='{self.title}', category={self.category.value})>"
@@ -89,25 +112,25 @@ class Skill(Base):
     """Tracks individual skills and proficiency levels."""
     __tablename__ = "skills"
     
-    id = Column(Integer, primary_key=True, autoincrement=True)
-    name = Column(String(100), unique=True, nullable=False)
-    category = Column(SQLEnum(ProjectCategory), nullable=False)
-    proficiency = Column(Float, default=0.0)  # 0-100 scale
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    name: Mapped[str] = mapped_column(String(100), unique=True, nullable=False)
+    category: Mapped[ProjectCategory] = mapped_column(_enum_column_type(ProjectCategory), nullable=False)
+    proficiency: Mapped[Optional[float]] = mapped_column(Float, default=0.0)  # 0-100 scale
     
     # Metadata
-    description = Column(Text)
-    related_technologies = Column(JSON, default=list)  # Technologies that contribute to this skill
+    description: Mapped[Optional[str]] = mapped_column(Text)
+    related_technologies: Mapped[Optional[List[str]]] = mapped_column(JSON, default=list)  # Technologies that contribute to this skill
     
     # Tracking
-    projects_count = Column(Integer, default=0)  # Number of projects using this skill
-    last_used = Column(DateTime, nullable=True)
+    projects_count: Mapped[Optional[int]] = mapped_column(Integer, default=0)  # Number of projects using this skill
+    last_used: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
     
     # Timestamps
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at: Mapped[Optional[datetime]] = mapped_column(DateTime, default=func.now(), server_default=func.now())
+    updated_at: Mapped[Optional[datetime]] = mapped_column(DateTime, default=func.now(), server_default=func.now(), onupdate=func.now())
     
     # Relationships
-    project_skills = relationship("ProjectSkill", back_populates="skill")
+    project_skills: Mapped[List["ProjectSkill"]] = relationship("ProjectSkill", back_populates="skill")
     
     def __repr__(self):
         return f"<Skill(id={self.id}, name='{self.name}', proficiency={self.proficiency:.1f})>"
@@ -116,17 +139,21 @@ class Skill(Base):
 class ProjectSkill(Base):
     """Many-to-many relationship between projects and skills."""
     __tablename__ = "project_skills"
+    __table_args__ = (
+        Index("ix_project_skills_project", "project_id"),
+        Index("ix_project_skills_skill", "skill_id"),
+    )
     
-    id = Column(Integer, primary_key=True, autoincrement=True)
-    project_id = Column(Integer, ForeignKey("projects.id"), nullable=False)
-    skill_id = Column(Integer, ForeignKey("skills.id"), nullable=False)
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    project_id: Mapped[int] = mapped_column(ForeignKey("projects.id"), nullable=False)
+    skill_id: Mapped[int] = mapped_column(ForeignKey("skills.id"), nullable=False)
     
     # How much this project contributed to the skill (weight)
-    contribution_weight = Column(Float, default=1.0)
+    contribution_weight: Mapped[Optional[float]] = mapped_column(Float, default=1.0)
     
     # Relationships
-    project = relationship("Project", back_populates="project_skills")
-    skill = relationship("Skill", back_populates="project_skills")
+    project: Mapped["Project"] = relationship("Project", back_populates="project_skills")
+    skill: Mapped["Skill"] = relationship("Skill", back_populates="project_skills")
     
     def __repr__(self):
         return f"<ProjectSkill(project_id={self.project_id}, skill_id={self.skill_id})>"
@@ -135,63 +162,125 @@ class ProjectSkill(Base):
 class Commit(Base):
     """Tracks individual Git commits."""
     __tablename__ = "commits"
+    __table_args__ = (
+        Index("ix_commits_project_time", "project_id", "committed_at"),
+    )
     
-    id = Column(Integer, primary_key=True, autoincrement=True)
-    project_id = Column(Integer, ForeignKey("projects.id"), nullable=False)
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    project_id: Mapped[int] = mapped_column(ForeignKey("projects.id"), nullable=False)
     
     # Commit information
-    commit_hash = Column(String(40), unique=True)
-    commit_message = Column(Text, nullable=False)
-    commit_type = Column(String(50))  # feat, fix, docs, refactor, test, etc.
+    commit_hash: Mapped[Optional[str]] = mapped_column(String(40), unique=True)
+    commit_message: Mapped[str] = mapped_column(Text, nullable=False)
+    commit_type: Mapped[Optional[str]] = mapped_column(String(50))  # feat, fix, docs, refactor, test, etc.
     
     # Files changed
-    files_changed = Column(JSON, default=list)  # List of file paths
-    additions = Column(Integer, default=0)
-    deletions = Column(Integer, default=0)
+    files_changed: Mapped[Optional[List[str]]] = mapped_column(JSON, default=list, deferred=True)  # List of file paths (mirrored in commit_files, loaded on access)
+    additions: Mapped[Optional[int]] = mapped_column(Integer, default=0)
+    deletions: Mapped[Optional[int]] = mapped_column(Integer, default=0)
     
     # Metadata
-    author_name = Column(String(100))
-    author_email = Column(String(200))
+    author_name: Mapped[Optional[str]] = mapped_column(String(100))
+    author_email: Mapped[Optional[str]] = mapped_column(String(200))
     
     # Timestamps
-    committed_at = Column(DateTime, default=datetime.utcnow)
-    pushed_at = Column(DateTime, nullable=True)
+    committed_at: Mapped[Optional[datetime]] = mapped_column(DateTime, default=func.now(), server_default=func.now())
+    pushed_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
     
     # Relationships
-    project = relationship("Project", back_populates="commits")
+    project: Mapped["Project"] = relationship("Project", back_populates="commits")
+    file_links: Mapped[List["CommitFile"]] = relationship("CommitFile", back_populates="commit", cascade="all, delete-orphan")
     
     def __repr__(self):
         return f"<Commit(id={self.id}, message='{self.commit_message[:50]}...')>"
 
 
+class ProjectTechnology(Base):
+    """One row per technology used by a project (indexed form of Project.technologies)."""
+    __tablename__ = "project_technologies"
+    __table_args__ = (
+        UniqueConstraint("project_id", "name", name="uq_project_technologies_project_name"),
+        Index("ix_project_technologies_name", "name"),
+    )
+    
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    project_id: Mapped[int] = mapped_column(ForeignKey("projects.id"), nullable=False)
+    name: Mapped[str] = mapped_column(String(100), nullable=False)
+    
+    # Relationships
+    project: Mapped["Project"] = relationship("Project", back_populates="technology_links")
+    
+    def __repr__(self):
+        return f"<ProjectTechnology(project_id={self.project_id}, name='{self.name}')>"
+
+
+class CommitFile(Base):
+    """One row per file touched by a commit (indexed form of Commit.files_changed)."""
+    __tablename__ = "commit_files"
+    __table_args__ = (
+        UniqueConstraint("commit_id", "path", name="uq_commit_files_commit_path"),
+        Index("ix_commit_files_path", "path"),
+    )
+    
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    commit_id: Mapped[int] = mapped_column(ForeignKey("commits.id"), nullable=False)
+    path: Mapped[str] = mapped_column(String(500), nullable=False)
+    
+    # Relationships
+    commit: Mapped["Commit"] = relationship("Commit", back_populates="file_links")
+    
+    def __repr__(self):
+        return f"<CommitFile(commit_id={self.commit_id}, path='{self.path}')>"
+
+
+@event.listens_for(Project.technologies, "set")
+def _sync_project_technologies(target, value, oldvalue, initiator):
+    """Keep project_technologies rows in step with the JSON list."""
+    existing = {link.name: link for link in target.technology_links}
+    target.technology_links = [
+        existing.get(name) or ProjectTechnology(name=name)
+        for name in dict.fromkeys(str(t) for t in (value or []))
+    ]
+
+
+@event.listens_for(Commit.files_changed, "set")
+def _sync_commit_files(target, value, oldvalue, initiator):
+    """Keep commit_files rows in step with the JSON list."""
+    existing = {link.path: link for link in target.file_links}
+    target.file_links = [
+        existing.get(path) or CommitFile(path=path)
+        for path in dict.fromkeys(str(f) for f in (value or []))
+    ]
+
+
 class DailyActivity(Base):
     """Tracks daily activity and summary statistics."""
     __tablename__ = "daily_activities"
     
-    id = Column(Integer, primary_key=True, autoincrement=True)
-    date = Column(DateTime, unique=True, nullable=False)  # Date only (time set to 00:00:00)
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    date: Mapped[datetime] = mapped_column(DateTime, unique=True, nullable=False)  # Date only (time set to 00:00:00)
     
     # Activity metrics
-    projects_created = Column(Integer, default=0)
-    projects_completed = Column(Integer, default=0)
-    commits_made = Column(Integer, default=0)
-    lines_added = Column(Integer, default=0)
-    lines_deleted = Column(Integer, default=0)
+    projects_created: Mapped[Optional[int]] = mapped_column(Integer, default=0)
+    projects_completed: Mapped[Optional[int]] = mapped_column(Integer, default=0)
+    commits_made: Mapped[Optional[int]] = mapped_column(Integer, default=0)
+    lines_added: Mapped[Optional[int]] = mapped_column(Integer, default=0)
+    lines_deleted: Mapped[Optional[int]] = mapped_column(Integer, default=0)
     
     # Skills worked on
-    skills_practiced = Column(JSON, default=list)  # List of skill IDs
-    technologies_used = Column(JSON, default=list)  # List of technologies
+    skills_practiced: Mapped[Optional[List[int]]] = mapped_column(JSON, default=list)  # List of skill IDs
+    technologies_used: Mapped[Optional[List[str]]] = mapped_column(JSON, default=list)  # List of technologies
     
     # Quality metrics
-    average_quality_score = Column(Float, default=0.0)
+    average_quality_score: Mapped[Optional[float]] = mapped_column(Float, default=0.0)
     
     # Execution metadata
-    execution_successful = Column(Boolean, default=True)
-    execution_time_seconds = Column(Float, default=0.0)
-    error_message = Column(Text, nullable=True)
+    execution_successful: Mapped[Optional[bool]] = mapped_column(Boolean, default=True)
+    execution_time_seconds: Mapped[Optional[float]] = mapped_column(Float, default=0.0)
+    error_message: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
     
     # Timestamps
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at: Mapped[Optional[datetime]] = mapped_column(DateTime, default=func.now(), server_default=func.now())
     
     def __repr__(self):
         return f"<DailyActivity(date={self.date.date()}, projects={self.projects_created})>"
@@ -200,15 +289,18 @@ class DailyActivity(Base):
 class Achievement(Base):
     """Gamification achievements."""
     __tablename__ = 'achievements'
-    
-    id = Column(Integer, primary_key=True)
-    name = Column(String(100), unique=True)
-    description = Column(String(255))
-    icon = Column(String(10))  # Emoji icon
-    criteria_type = Column(String(50))  # 'project_count', 'streak', 'skill_level'
-    criteria_value = Column(Integer)
-    is_unlocked = Column(Boolean, default=False)
-    unlocked_at = Column(DateTime, nullable=True)
+    __table_args__ = (
+        Index("ix_achievements_unlocked_type", "is_unlocked", "criteria_type"),
+    )
+    
+    id: Mapped[int] = mapped_column(primary_key=True)
+    name: Mapped[Optional[str]] = mapped_column(String(100), unique=True)
+    description: Mapped[Optional[str]] = mapped_column(String(255))
+    icon: Mapped[Optional[str]] = mapped_column(String(10))  # Emoji icon
+    criteria_type: Mapped[Optional[str]] = mapped_column(String(50))  # 'project_count', 'streak', 'skill_level'
+    criteria_value: Mapped[Optional[int]] = mapped_column(Integer)
+    is_unlocked: Mapped[Optional[bool]] = mapped_column(Boolean, default=False)
+    unlocked_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
     
     def __repr__(self):
         return f"<Achievement(name='{self.name}', unlocked={self.is_unlocked})>"
@@ -218,18 +310,28 @@ class SystemMetadata(Base):
     """Stores system-level metadata and settings."""
     __tablename__ = "system_metadata"
     
-    id = Column(Integer, primary_key=True, autoincrement=True)
-    key = Column(String(100), unique=True, nullable=False)
-    value = Column(Text)
-    value_type = Column(String(20))  # str, int, float, bool, json
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    key: Mapped[str] = mapped_column(String(100), unique=True, nullable=False)
+    value: Mapped[Optional[str]] = mapped_column(Text, deferred=True)
+    value_type: Mapped[Optional[str]] = mapped_column(String(20))  # str, int, float, bool, json
     
-    description = Column(Text)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    description: Mapped[Optional[str]] = mapped_column(Text)
+    updated_at: Mapped[Optional[datetime]] = mapped_column(DateTime, default=func.now(), server_default=func.now(), onupdate=func.now())
     
     def __repr__(self):
         return f"<SystemMetadata(key='{self.key}', value='{self.value}')>"
 
 
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    """Tune each new SQLite connection: WAL journal, fewer fsyncs, larger page cache."""
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.execute("PRAGMA cache_size=-64000")  # ~64 MB
+    cursor.close()
+
+
 class DatabaseManager:
     """Manages database connection and operations."""
     
@@ -241,12 +343,53 @@ class DatabaseManager:
             database_url: SQLAlchemy database URL
         """
         self.database_url = database_url
-        self.engine = create_engine(database_url, echo=False)
-        self.SessionLocal = sessionmaker(bind=self.engine, autocommit=False, autoflush=False)
+    
+    @cached_property
+    def engine(self):
+        """SQLAlchemy engine, created on first use."""
+        if not self.database_url.startswith("sqlite"):
+            return create_engine(self.database_url, echo=False)
+        
+        # Pooled connections may be handed to other threads (scheduler, web app)
+        engine = create_engine(
+            self.database_url,
+            echo=False,
+            connect_args={"check_same_thread": False}
+        )
+        event.listen(engine, "connect", _set_sqlite_pragmas)
+        return engine
+    
+    @cached_property
+    def SessionLocal(self) -> sessionmaker:
+        """Session factory bound to the engine, created on first use."""
+        return sessionmaker(bind=self.engine, autocommit=False, autoflush=False)
         
     def create_tables(self):
-        """Create all database tables."""
+        """Create all database tables (and any indexes missing from existing ones)."""
         Base.metadata.create_all(bind=self.engine)
+        # create_all skips existing tables entirely, so add new indexes explicitly
+        for table in Base.metadata.sorted_tables:
+            for index in table.indexes:
+                index.create(bind=self.engine, checkfirst=True)
+        
+        with self.get_session() as session:
+            self._backfill_link_tables(session)
+    
+    def _backfill_link_tables(self, session: Session):
+        """Populate project_technologies/commit_files for rows created before they existed."""
+        projects = session.query(Project).filter(
+            Project.technologies.isnot(None), ~Project.technology_links.any()
+        ).all()
+        for project in projects:
+            _sync_project_technologies(project, project.technologies, None, None)
+        
+        commits = session.query(Commit).options(undefer(Commit.files_changed)).filter(
+            Commit.files_changed.isnot(None), ~Commit.file_links.any()
+        ).all()
+        for commit in commits:
+            _sync_commit_files(commit, commit.files_changed, None, None)
+        
+        session.commit()
     
     def drop_tables(self):
         """Drop all database tables (use with caution!)."""
@@ -263,11 +406,22 @@ class DatabaseManager:
     
     def initialize_default_skills(self, session: Session):
         """
-        Initialize default skills in the database.
+        Initialize default skills and achievements in a single transaction.
         
         Args:
             session: Database session
         """
+        self._seed_skills(session)
+        self._seed_achievements(session)
+        session.commit()
+    
+    def initialize_achievements(self, session: Session):
+        """Initialize default achievements."""
+        self._seed_achievements(session)
+        session.commit()
+    
+    def _seed_skills(self, session: Session):
+        """Insert any missing default skills (no commit)."""
         default_skills = [
             # AI/ML Skills
             {"name": "Machine Learning", "category": ProjectCategory.AI_ML, 
@@ -318,20 +472,15 @@ class DatabaseManager:
              "description": "Vulnerability assessment and penetration testing"},
         ]
         
-        for skill_data in default_skills:
-            # Check if skill already exists
-            existing = session.query(Skill).filter_by(name=skill_data["name"]).first()
-            if not existing:
-                skill = Skill(**skill_data)
-                session.add(skill)
-        
-        session.commit()
-        
-        # Initialize Achievements
-        self.initialize_achievements(session)
-    
-    def initialize_achievements(self, session: Session):
-        """Initialize default achievements."""
+        # One query for the existing names, one bulk insert for the rest
+        names = [skill_data["name"] for skill_data in default_skills]
+        existing = set(session.execute(select(Skill.name).where(Skill.name.in_(names))).scalars())
+        missing = [skill_data for skill_data in default_skills if skill_data["name"] not in existing]
+        if missing:
+            session.bulk_insert_mappings(Skill, missing)
+    
+    def _seed_achievements(self, session: Session):
+        """Insert any missing default achievements (no commit)."""
         defaults = [
             # Project Counts
             {"name": "Hello World", "description": "Create your first project", "icon": "🌱", "criteria_type": "project_count", "criteria_value": 1},
@@ -346,12 +495,11 @@ class DatabaseManager:
             {"name": "Expert Engineer", "description": "Reach 80% average skill proficiency", "icon": "🚀", "criteria_type": "skill_level", "criteria_value": 80},
         ]
         
-        for data in defaults:
-            if not session.query(Achievement).filter_by(name=data["name"]).first():
-                ach = Achievement(**data)
-                session.add(ach)
-        
-        session.commit()
+        names = [data["name"] for data in defaults]
+        existing = set(session.execute(select(Achievement.name).where(Achievement.name.in_(names))).scalars())
+        missing = [data for data in defaults if data["name"] not in existing]
+        if missing:
+            session.bulk_insert_mappings(Achievement, missing)
     
     def get_or_create_skill(self, session: Session, name: str, category: ProjectCategory) -> Skill:
         """
@@ -365,31 +513,59 @@ class DatabaseManager:
         Returns:
             Skill: The skill object
         """
-        skill = session.query(Skill).filter_by(name=name).first()
-        if not skill:
-            skill = Skill(name=name, category=category)
-            session.add(skill)
-            session.commit()
+        skill = self.get_or_create_skills(session, [(name, category)])[name]
+        session.commit()
         return skill
+    
+    def get_or_create_skills(self, session: Session, pairs: List[Tuple[str, ProjectCategory]]) -> Dict[str, Skill]:
+        """
+        Get or create several skills with one upsert and one select.
+        
+        The caller owns the transaction; nothing is committed here.
+        
+        Args:
+            session: Database session
+            pairs: (skill name, category) tuples; the first category wins for duplicates
+            
+        Returns:
+            Dict mapping skill name to Skill object
+        """
+        rows = {}
+        for name, category in pairs:
+            rows.setdefault(name, {"name": name, "category": category})
+        if not rows:
+            return {}
+        
+        dialect = session.get_bind().dialect.name
+        if dialect in ("sqlite", "postgresql"):
+            insert = sqlite_insert if dialect == "sqlite" else postgresql_insert
+            stmt = insert(Skill).values(list(rows.values())).on_conflict_do_nothing(index_elements=["name"])
+            session.execute(stmt)
+        else:
+            existing = set(session.execute(select(Skill.name).where(Skill.name.in_(rows))).scalars())
+            session.add_all(Skill(**row) for name, row in rows.items() if name not in existing)
+            session.flush()
+        
+        skills = session.query(Skill).filter(Skill.name.in_(rows)).all()
+        return {skill.name: skill for skill in skills}
 
 
-# Singleton instance
-_db_manager_instance: Optional[DatabaseManager] = None
+DEFAULT_DATABASE_URL = "sqlite:///data/activity_tracker.db"
 
 
 def get_database_manager(database_url: Optional[str] = None) -> DatabaseManager:
     """
-    Get the singleton DatabaseManager instance.
+    Get the shared DatabaseManager instance for a database URL.
     
     Args:
-        database_url: Database URL (only used on first call)
+        database_url: Database URL (defaults to the local SQLite database)
         
     Returns:
         DatabaseManager: The database manager instance
     """
-    global _db_manager_instance
-    if _db_manager_instance is None:
-        if database_url is None:
-            database_url = "sqlite:///data/activity_tracker.db"
-        _db_manager_instance = DatabaseManager(database_url)
-    return _db_manager_instance
+    return _database_manager_for(database_url or DEFAULT_DATABASE_URL)
+
+
+@lru_cache(maxsize=None)
+def _database_manager_for(database_url: str) -> DatabaseManager:
+    return DatabaseManager(database_url)
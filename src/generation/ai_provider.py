@@ -3,10 +3,43 @@ AI Provider Abstraction Layer
 Supports multiple LLM providers (OpenAI, Ollama) with unified interface.
 """
 
-from abc import ABC, abstractmethod
-from typing import List, Dict, Any, Optional
+from collections import OrderedDict
+from contextlib import closing
+from dataclasses import dataclass
+from typing import List, Dict, Any, Iterable, Iterator, Optional, Protocol, Tuple
 from enum import Enum
+from pathlib import Path
+import asyncio
+import hashlib
+import importlib.util
+import json
 import os
+import random
+import sqlite3
+import textwrap
+import threading
+import time
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - stdlib fallback
+    orjson = None
+
+_JSON_HEADERS = {"Content-Type": "application/json"}
+
+
+def _json_dumps(obj: Any) -> bytes:
+    """Encode a request body as UTF-8 JSON bytes."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False).encode("utf-8")
+
+
+def _json_loads(data: bytes) -> Any:
+    """Decode a JSON response body."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
 
 
 class AIProvider(str, Enum):
@@ -15,34 +48,123 @@ class AIProvider(str, Enum):
     OLLAMA = "ollama"
 
 
+@dataclass(slots=True)
 class Message:
     """Represents a chat message."""
     
-    def __init__(self, role: str, content: str):
-        """
-        Initialize a message.
-        
-        Args:
-            role: Message role ("system", "user", "assistant")
-            content: Message content
-        """
-        self.role = role
-        self.content = content
+    role: str  # "system", "user" or "assistant"
+    content: str
+
+
+# HTTP clients shared by every provider instance with the same credentials/server,
+# so rebuilding an AIClient (e.g. from_config) reuses warm keep-alive pools
+_openai_clients: Dict[str, Any] = {}
+_ollama_clients: Dict[str, Any] = {}
+_clients_lock = threading.Lock()
+
+# Transient failures (connection resets, rate limits, 5xx) are retried with backoff
+_MAX_RETRIES = 3
+_RETRYABLE_STATUSES = (429, 500, 502, 503, 504)
+
+
+def _is_retryable(status_code: int) -> bool:
+    """Rate limits and transient server errors are retried; other statuses are not."""
+    return status_code in _RETRYABLE_STATUSES
+
+# HTTP/2 multiplexes concurrent requests over one connection; httpx needs h2 for it
+_HTTP2 = importlib.util.find_spec("h2") is not None
+
+
+def _http_limits():
+    """Connection pool limits shared by every httpx client."""
+    import httpx
+    return httpx.Limits(max_keepalive_connections=20, max_connections=100, keepalive_expiry=30.0)
+
+
+# How long an is_available() result is reused before probing again
+_AVAIL_TTL = 30.0
+
+
+def _backoff_delay(attempt: int) -> float:
+    """Exponential backoff with jitter, in seconds, before retry number attempt + 1."""
+    return 0.5 * (2 ** attempt) + random.uniform(0, 0.5)
+
+
+def _get_openai_client(api_key: str):
+    """Shared OpenAI client for an API key."""
+    with _clients_lock:
+        client = _openai_clients.get(api_key)
+        if client is None:
+            import httpx
+            from openai import OpenAI
+            
+            # The SDK retries 429/5xx with backoff; the transport retries failed connects
+            client = OpenAI(
+                api_key=api_key,
+                max_retries=_MAX_RETRIES,
+                http_client=httpx.Client(
+                    transport=httpx.HTTPTransport(retries=_MAX_RETRIES, http2=_HTTP2, limits=_http_limits()),
+                    timeout=httpx.Timeout(300.0, connect=10.0)
+                )
+            )
+            _openai_clients[api_key] = client
+        return client
+
+
+def _get_ollama_client(base_url: str):
+    """Shared pooled httpx client for an Ollama server."""
+    with _clients_lock:
+        client = _ollama_clients.get(base_url)
+        if client is None:
+            import httpx
+            
+            # The transport retries failed connects; status retries happen in OllamaProvider._send
+            client = httpx.Client(
+                transport=httpx.HTTPTransport(retries=_MAX_RETRIES, http2=_HTTP2, limits=_http_limits()),
+                timeout=httpx.Timeout(300.0, connect=5.0)
+            )
+            _ollama_clients[base_url] = client
+        return client
+
+
+def _collect_until(pieces: Iterable[str], stop_on: str) -> str:
+    """
+    Concatenate streamed text pieces, stopping at the first stop_on marker.
     
-    def to_dict(self) -> Dict[str, str]:
-        """Convert to dictionary format."""
-        return {"role": self.role, "content": self.content}
+    Returns the text before the marker (or everything if it never appears).
+    Pieces are appended to one bytearray, so accumulation stays linear in the
+    response length instead of copying the whole string per token.
+    """
+    marker = stop_on.encode("utf-8")
+    buf = bytearray()
+    for piece in pieces:
+        # The marker may straddle the previous piece boundary
+        search_from = max(0, len(buf) - len(marker) + 1)
+        buf.extend(piece.encode("utf-8"))
+        index = buf.find(marker, search_from)
+        if index != -1:
+            del buf[index:]
+            break
+    return buf.decode("utf-8")
 
 
-class LLMProvider(ABC):
-    """Abstract base class for LLM providers."""
+class LLMProvider(Protocol):
+    """
+    Interface for LLM providers.
+    
+    Any object with these members works; subclassing is only needed to
+    inherit the default agenerate().
+    """
+    
+    model: str
     
-    @abstractmethod
     def generate(
         self,
         messages: List[Message],
         temperature: float = 0.7,
-        max_tokens: int = 2000
+        max_tokens: int = 2000,
+        json_mode: bool = False,
+        stop_on: Optional[str] = None
     ) -> str:
         """
         Generate text based on messages.
@@ -51,16 +173,50 @@ class LLMProvider(ABC):
             messages: List of conversation messages
             temperature: Sampling temperature (0.0-1.0)
             max_tokens: Maximum tokens to generate
+            json_mode: Constrain the response to a JSON object
+            stop_on: Stream the response and stop once this marker appears;
+                the returned text ends before the marker
             
         Returns:
             Generated text response
         """
-        pass
+        ...
+    
+    async def agenerate(
+        self,
+        messages: List[Message],
+        temperature: float = 0.7,
+        max_tokens: int = 2000
+    ) -> str:
+        """
+        Async variant of generate().
+        
+        The default runs generate() in a worker thread; providers with a native
+        async client override this.
+        """
+        return await asyncio.to_thread(self.generate, messages, temperature, max_tokens)
+    
+    def stream(
+        self,
+        messages: List[Message],
+        temperature: float = 0.7,
+        max_tokens: int = 2000,
+        json_mode: bool = False
+    ) -> Iterator[str]:
+        """
+        Yield the response in chunks as it is generated.
+        
+        The default yields the whole generate() result as one chunk; providers
+        with a streaming API override this.
+        """
+        yield self.generate(messages, temperature, max_tokens, json_mode)
+    
+    async def aclose(self):
+        """Close async clients bound to the running event loop (none by default)."""
     
-    @abstractmethod
     def is_available(self) -> bool:
         """Check if the provider is available and configured."""
-        pass
+        ...
 
 
 class OpenAIProvider(LLMProvider):
@@ -77,13 +233,15 @@ class OpenAIProvider(LLMProvider):
         self.api_key = api_key
         self.model = model
         self._client = None
+        self._async_client = None
+        self._async_loop = None
+        self._avail_cache: Optional[Tuple[float, bool]] = None
     
     def _get_client(self):
         """Lazy initialization of OpenAI client."""
         if self._client is None:
             try:
-                from openai import OpenAI
-                self._client = OpenAI(api_key=self.api_key)
+                self._client = _get_openai_client(self.api_key)
             except ImportError:
                 raise ImportError(
                     "OpenAI library not installed. "
@@ -91,20 +249,101 @@ class OpenAIProvider(LLMProvider):
                 )
         return self._client
     
+    def _get_async_client(self):
+        """AsyncOpenAI client bound to the running event loop."""
+        loop = asyncio.get_running_loop()
+        if self._async_client is None or self._async_loop is not loop:
+            from openai import AsyncOpenAI
+            self._async_client = AsyncOpenAI(api_key=self.api_key, max_retries=_MAX_RETRIES)
+            self._async_loop = loop
+        return self._async_client
+    
+    async def aclose(self):
+        """Close the AsyncOpenAI client created for the running event loop."""
+        if self._async_client is None or self._async_loop is not asyncio.get_running_loop():
+            return
+        client, self._async_client, self._async_loop = self._async_client, None, None
+        await client.close()
+    
     def generate(
         self,
         messages: List[Message],
         temperature: float = 0.7,
-        max_tokens: int = 2000
+        max_tokens: int = 2000,
+        json_mode: bool = False,
+        stop_on: Optional[str] = None
     ) -> str:
         """Generate text using OpenAI API."""
+        if stop_on is not None:
+            # Closing the stream drops the connection so the server stops decoding
+            with closing(self.stream(messages, temperature, max_tokens, json_mode)) as pieces:
+                return _collect_until(pieces, stop_on)
+        
         client = self._get_client()
         
         # Convert messages to OpenAI format
-        message_dicts = [msg.to_dict() for msg in messages]
+        message_dicts = [{"role": msg.role, "content": msg.content} for msg in messages]
+        extra = {"response_format": {"type": "json_object"}} if json_mode else {}
         
         try:
             response = client.chat.completions.create(
+                model=self.model,
+                messages=message_dicts,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                **extra
+            )
+            
+            return response.choices[0].message.content
+        
+        except Exception as e:
+            raise RuntimeError(f"OpenAI API error: {e}")
+    
+    def stream(
+        self,
+        messages: List[Message],
+        temperature: float = 0.7,
+        max_tokens: int = 2000,
+        json_mode: bool = False
+    ) -> Iterator[str]:
+        """Yield response text deltas from the OpenAI streaming API."""
+        client = self._get_client()
+        message_dicts = [{"role": msg.role, "content": msg.content} for msg in messages]
+        extra = {"response_format": {"type": "json_object"}} if json_mode else {}
+        
+        try:
+            response = client.chat.completions.create(
+                model=self.model,
+                messages=message_dicts,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                stream=True,
+                **extra
+            )
+        except Exception as e:
+            raise RuntimeError(f"OpenAI API error: {e}")
+        
+        try:
+            for chunk in response:
+                if chunk.choices:
+                    yield chunk.choices[0].delta.content or ""
+        except Exception as e:
+            raise RuntimeError(f"OpenAI API error: {e}")
+        finally:
+            response.close()
+    
+    async def agenerate(
+        self,
+        messages: List[Message],
+        temperature: float = 0.7,
+        max_tokens: int = 2000
+    ) -> str:
+        """Generate text using the async OpenAI API."""
+        client = self._get_async_client()
+        message_dicts = [{"role": msg.role, "content": msg.content} for msg in messages]
+        
+        try:
+            response = await client.chat.completions.create(
                 model=self.model,
                 messages=message_dicts,
                 temperature=temperature,
@@ -117,89 +356,451 @@ class OpenAIProvider(LLMProvider):
             raise RuntimeError(f"OpenAI API error: {e}")
     
     def is_available(self) -> bool:
-        """Check if OpenAI is available."""
+        """Check if OpenAI is available (cached for _AVAIL_TTL seconds)."""
+        now = time.monotonic()
+        if self._avail_cache is not None and now - self._avail_cache[0] < _AVAIL_TTL:
+            return self._avail_cache[1]
+        
         try:
             self._get_client()
-            return bool(self.api_key)
+            available = bool(self.api_key)
         except Exception:
-            return False
+            available = False
+        
+        self._avail_cache = (now, available)
+        return available
 
 
 class OllamaProvider(LLMProvider):
     """Ollama local LLM provider implementation."""
     
-    def __init__(self, model: str = "llama3", base_url: str = "http://localhost:11434"):
+    def __init__(
+        self,
+        model: str = "llama3",
+        base_url: str = "http://localhost:11434",
+        keep_alive: str = "10m",
+        num_ctx: int = 2048,
+        num_thread: Optional[int] = None,
+        num_gpu: Optional[int] = None
+    ):
         """
         Initialize Ollama provider.
         
         Args:
-            model: Model name (e.g., "llama3", "codellama")
+            model: Model name (e.g., "llama3", "codellama", or a quant tag like "llama3:8b-instruct-q4_K_M")
             base_url: Ollama server URL
+            keep_alive: How long Ollama keeps the model loaded after a call
+            num_ctx: Context window size in tokens
+            num_thread: CPU threads used for inference (Ollama decides if None)
+            num_gpu: Layers offloaded to the GPU (Ollama decides if None)
         """
         self.model = model
         self.base_url = base_url
+        self.keep_alive = keep_alive
+        
+        # Runtime options sent with every request; unset ones are left to Ollama
+        self._runtime_options = {
+            key: value
+            for key, value in (("num_ctx", num_ctx), ("num_thread", num_thread), ("num_gpu", num_gpu))
+            if value is not None
+        }
+        
+        # Built once; generate() only fills in the per-call fields
+        self._chat_url = f"{base_url}/api/chat"
+        self._tags_url = f"{base_url}/api/tags"
+        self._body_tpl = {"model": model, "stream": False, "keep_alive": keep_alive}
+        
+        # Pooled keep-alive client shared by all providers for this server
+        self.client = _get_ollama_client(base_url)
+        
+        self._async_client = None
+        self._async_loop = None
+        self._avail_cache: Optional[Tuple[float, bool]] = None
+    
+    def close(self):
+        """Close the pooled HTTP connections shared for this server."""
+        with _clients_lock:
+            if _ollama_clients.get(self.base_url) is self.client:
+                del _ollama_clients[self.base_url]
+        self.client.close()
+    
+    def _get_async_client(self):
+        """Pooled httpx.AsyncClient bound to the running event loop."""
+        loop = asyncio.get_running_loop()
+        if self._async_client is None or self._async_loop is not loop:
+            import httpx
+            self._async_client = httpx.AsyncClient(
+                transport=httpx.AsyncHTTPTransport(retries=_MAX_RETRIES, http2=_HTTP2, limits=_http_limits()),
+                timeout=httpx.Timeout(300.0, connect=5.0)
+            )
+            self._async_loop = loop
+        return self._async_client
+    
+    async def aclose(self):
+        """Close the httpx.AsyncClient created for the running event loop."""
+        if self._async_client is None or self._async_loop is not asyncio.get_running_loop():
+            return
+        client, self._async_client, self._async_loop = self._async_client, None, None
+        await client.aclose()
+    
+    def _build_body(self, messages: List[Message], temperature: float, max_tokens: int) -> Dict[str, Any]:
+        """Fill the static request skeleton with the per-call fields."""
+        body = self._body_tpl.copy()
+        # Convert messages to Ollama chat format
+        body["messages"] = [{"role": msg.role, "content": msg.content} for msg in messages]
+        body["options"] = {"temperature": temperature, "num_predict": max_tokens, **self._runtime_options}
+        return body
+    
+    def _send(self, body: Dict[str, Any], stream: bool = False):
+        """POST a chat body, retrying rate-limited and 5xx responses with backoff."""
+        request = self.client.build_request("POST", self._chat_url, content=_json_dumps(body), headers=_JSON_HEADERS)
+        for attempt in range(_MAX_RETRIES + 1):
+            response = self.client.send(request, stream=stream)
+            if not _is_retryable(response.status_code) or attempt == _MAX_RETRIES:
+                return response
+            response.close()
+            time.sleep(_backoff_delay(attempt))
     
     def generate(
         self,
         messages: List[Message],
         temperature: float = 0.7,
-        max_tokens: int = 2000
+        max_tokens: int = 2000,
+        json_mode: bool = False,
+        stop_on: Optional[str] = None
     ) -> str:
         """Generate text using Ollama chat API."""
-        import requests
+        import httpx
         
-        # Convert messages to Ollama chat format
-        chat_messages = [{"role": msg.role, "content": msg.content} for msg in messages]
+        if stop_on is not None:
+            # Closing the response drops the connection so Ollama stops decoding
+            with closing(self.stream(messages, temperature, max_tokens, json_mode)) as pieces:
+                return _collect_until(pieces, stop_on)
+        
+        payload = self._build_body(messages, temperature, max_tokens)
+        if json_mode:
+            payload["format"] = "json"
+        
+        try:
+            response = self._send(payload)
+            response.raise_for_status()
+            result = _json_loads(response.content)
+            return result.get("message", {}).get("content", "")
+        
+        except httpx.HTTPError as e:
+            raise self._api_error(e)
+    
+    def stream(
+        self,
+        messages: List[Message],
+        temperature: float = 0.7,
+        max_tokens: int = 2000,
+        json_mode: bool = False
+    ) -> Iterator[str]:
+        """Yield response text chunks from Ollama's streaming chat API."""
+        import httpx
+        
+        payload = self._build_body(messages, temperature, max_tokens)
+        payload["stream"] = True
+        if json_mode:
+            payload["format"] = "json"
         
         try:
-            response = requests.post(
-                f"{self.base_url}/api/chat",
-                json={
-                    "model": self.model,
-                    "messages": chat_messages,
-                    "stream": False,
-                    "options": {
-                        "temperature": temperature,
-                        "num_predict": max_tokens
-                    }
-                },
-                timeout=300  # 5 minute timeout for generation
+            response = self._send(payload, stream=True)
+            try:
+                response.raise_for_status()
+                for line in response.iter_lines():
+                    if line:
+                        yield _json_loads(line).get("message", {}).get("content", "")
+            finally:
+                response.close()
+        
+        except httpx.HTTPError as e:
+            raise self._api_error(e)
+    
+    def _api_error(self, error: Exception) -> RuntimeError:
+        """Wrap an httpx error with a hint about what to check."""
+        import httpx
+        
+        if isinstance(error, httpx.HTTPStatusError):
+            status = error.response.status_code
+            if _is_retryable(status):
+                # _send already backed off and retried these
+                return RuntimeError(
+                    f"Ollama still returned {status} after {_MAX_RETRIES} retries: {error}\n"
+                    f"The server at {self.base_url} is overloaded or failing."
+                )
+            # Other 4xx are not retried: the request itself is wrong
+            return RuntimeError(
+                f"Ollama rejected the request ({status}, not retried): {error}\n"
+                f"Check that model '{self.model}' is pulled."
+            )
+        if isinstance(error, (httpx.ConnectError, httpx.ConnectTimeout)):
+            # Only connection failures are retried by the transport
+            return RuntimeError(
+                f"Could not connect to Ollama after {_MAX_RETRIES} retries: {error}\n"
+                f"Make sure Ollama is running at {self.base_url}."
+            )
+        return RuntimeError(
+            f"Ollama API error: {error}\n"
+            f"Make sure Ollama is running at {self.base_url} and model '{self.model}' is pulled."
+        )
+    
+    async def agenerate(
+        self,
+        messages: List[Message],
+        temperature: float = 0.7,
+        max_tokens: int = 2000
+    ) -> str:
+        """Generate text using Ollama chat API without blocking the event loop."""
+        import httpx
+        
+        client = self._get_async_client()
+        
+        try:
+            response = await client.post(
+                self._chat_url,
+                content=_json_dumps(self._build_body(messages, temperature, max_tokens)),
+                headers=_JSON_HEADERS
             )
             
             response.raise_for_status()
-            result = response.json()
+            result = _json_loads(response.content)
             
             return result.get("message", {}).get("content", "")
         
-        except requests.exceptions.RequestException as e:
+        except httpx.HTTPError as e:
             raise RuntimeError(
                 f"Ollama API error: {e}\n"
                 f"Make sure Ollama is running at {self.base_url} and model '{self.model}' is pulled."
             )
     
+    def warmup(self):
+        """
+        Load the model ahead of a burst of calls.
+        
+        Generates a single token so the first real request doesn't pay the
+        model load time. Failures are ignored; the real call will report them.
+        """
+        body = self._build_body([Message("user", "hi")], 0.0, 1)
+        try:
+            self._send(body)
+        except Exception:
+            pass
+    
     def is_available(self) -> bool:
-        """Check if Ollama is available."""
-        import requests
+        """Check if Ollama is available (cached for _AVAIL_TTL seconds)."""
+        now = time.monotonic()
+        if self._avail_cache is not None and now - self._avail_cache[0] < _AVAIL_TTL:
+            return self._avail_cache[1]
         
         try:
-            response = requests.get(f"{self.base_url}/api/tags", timeout=5)
-            return response.status_code == 200
+            response = self.client.get(self._tags_url, timeout=2)
+            available = response.status_code == 200
         except Exception:
-            return False
+            available = False
+        
+        self._avail_cache = (now, available)
+        return available
+
+
+class ResponseCache:
+    """Content-addressed, sqlite-backed store of LLM responses."""
+    
+    DEFAULT_PATH = Path.home() / ".cache" / "gh_streak_llm" / "responses.db"
+    DEFAULT_EXPIRE = 7 * 86400
+    
+    def __init__(self, path: Optional[Path] = None):
+        """
+        Initialize the cache.
+        
+        Args:
+            path: SQLite file to store responses in
+        """
+        self.path = Path(path) if path else self.DEFAULT_PATH
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        # Every set() commits; WAL + synchronous=NORMAL keeps that from fsyncing each time
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key TEXT PRIMARY KEY, response TEXT NOT NULL, expires_at REAL NOT NULL)"
+        )
+        self._conn.commit()
+    
+    @staticmethod
+    def make_key(
+        model: str,
+        messages: List[Message],
+        temperature: float,
+        max_tokens: int,
+        stop_on: Optional[str] = None
+    ) -> str:
+        """Hash everything that determines a response."""
+        fields = {
+            "model": model,
+            "msgs": [{"role": msg.role, "content": msg.content} for msg in messages],
+            "t": temperature,
+            "n": max_tokens,
+        }
+        if stop_on is not None:
+            fields["stop"] = stop_on
+        payload = json.dumps(fields, sort_keys=True)
+        return hashlib.blake2b(payload.encode()).hexdigest()
+    
+    def get(self, key: str) -> Optional[str]:
+        """Return the stored response, or None if missing or expired."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT response, expires_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+        
+        if row is None or row[1] < time.time():
+            return None
+        return row[0]
+    
+    def set(self, key: str, response: str, expire: int = DEFAULT_EXPIRE):
+        """Store a response for expire seconds."""
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, response, expires_at) VALUES (?, ?, ?)",
+                (key, response, time.time() + expire)
+            )
+            self._conn.commit()
+    
+    def close(self):
+        """Close the underlying connection."""
+        self._conn.close()
+
+
+class SemanticCache:
+    """
+    Embedding-based cache that matches paraphrased prompts.
+    
+    Requires the optional fastembed and numpy packages.
+    """
+    
+    DEFAULT_PATH = ResponseCache.DEFAULT_PATH.with_name("semantic.npz")
+    DEFAULT_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
+    
+    def __init__(self, path: Optional[Path] = None, threshold: float = 0.93, model_name: str = DEFAULT_MODEL):
+        """
+        Initialize the cache.
+        
+        Args:
+            path: .npz file the index is persisted to
+            threshold: Minimum cosine similarity for a hit
+            model_name: fastembed model used to embed prompts
+        """
+        import numpy as np
+        from fastembed import TextEmbedding
+        
+        self._np = np
+        self._embedder = TextEmbedding(model_name=model_name)
+        self.path = Path(path) if path else self.DEFAULT_PATH
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.threshold = threshold
+        self._lock = threading.Lock()
+        
+        if self.path.exists():
+            with np.load(self.path, allow_pickle=False) as data:
+                self._vectors = data["vectors"]
+                self._scopes = list(data["scopes"])
+                self._responses = list(data["responses"])
+        else:
+            self._vectors = np.empty((0, 0), dtype=np.float32)
+            self._scopes = []
+            self._responses = []
+    
+    @staticmethod
+    def make_scope(model: str, messages: List[Message], stop_on: Optional[str] = None) -> str:
+        """Hash the parts of a request that must match exactly (model, system prompt, stop marker)."""
+        system = [msg.content for msg in messages if msg.role == "system"]
+        return hashlib.blake2b(json.dumps([model, system, stop_on]).encode(), digest_size=16).hexdigest()
+    
+    @staticmethod
+    def prompt_text(messages: List[Message]) -> str:
+        """Text that gets embedded: the concatenated user messages."""
+        return "\n".join(msg.content for msg in messages if msg.role == "user")
+    
+    def _embed(self, text: str):
+        """Embed text as a unit-length float32 vector."""
+        np = self._np
+        vector = np.asarray(next(iter(self._embedder.embed([text]))), dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+    
+    def get(self, scope: str, text: str) -> Optional[str]:
+        """Return the response of the most similar cached prompt above threshold."""
+        if not self._responses:
+            return None
+        
+        np = self._np
+        query = self._embed(text)
+        
+        with self._lock:
+            # Stored vectors are unit length, so the dot product is cosine similarity
+            similarities = self._vectors @ query
+            mask = np.fromiter((s == scope for s in self._scopes), dtype=bool, count=len(self._scopes))
+            if not mask.any():
+                return None
+            similarities = np.where(mask, similarities, -1.0)
+            best = int(np.argmax(similarities))
+            if similarities[best] >= self.threshold:
+                return str(self._responses[best])
+        
+        return None
+    
+    def set(self, scope: str, text: str, response: str):
+        """Add a prompt/response pair and persist the index."""
+        np = self._np
+        vector = self._embed(text)
+        
+        with self._lock:
+            if self._vectors.size == 0:
+                self._vectors = vector[np.newaxis, :]
+            else:
+                self._vectors = np.vstack([self._vectors, vector])
+            self._scopes.append(scope)
+            self._responses.append(response)
+            
+            np.savez(
+                self.path,
+                vectors=self._vectors,
+                scopes=np.array(self._scopes, dtype=str),
+                responses=np.array(self._responses, dtype=str)
+            )
 
 
 class AIClient:
     """Unified AI client that works with multiple providers."""
     
-    def __init__(self, provider: AIProvider, **kwargs):
+    SEMANTIC_CACHE_MAX_TEMPERATURE = 0.3
+    L1_CACHE_SIZE = 1024
+    
+    # 4-bit quant: roughly a quarter of the FP16 memory traffic per decoded token
+    DEFAULT_OLLAMA_MODEL = "llama3:8b-instruct-q4_K_M"
+    
+    def __init__(self, provider: AIProvider, cache: bool = False, semantic_cache: bool = False, **kwargs):
         """
         Initialize AI client.
         
         Args:
             provider: AI provider to use
+            cache: Cache deterministic (temperature 0) responses on disk
+            semantic_cache: Also match paraphrased low-temperature prompts (needs fastembed)
             **kwargs: Provider-specific configuration
         """
         self.provider_type = provider
+        self.cache = ResponseCache() if cache else None
+        # In-process LRU in front of the disk cache
+        self._l1: "OrderedDict[str, str]" = OrderedDict()
+        # One client is shared by the generator's worker threads
+        self._l1_lock = threading.Lock()
+        self.semantic_cache = SemanticCache() if semantic_cache else None
         
         if provider == AIProvider.OPENAI:
             api_key = kwargs.get('api_key') or os.getenv('OPENAI_API_KEY')
@@ -211,20 +812,31 @@ class AIClient:
             self.provider = OpenAIProvider(api_key=api_key, model=model)
         
         elif provider == AIProvider.OLLAMA:
-            model = kwargs.get('model', 'llama3')
+            model = kwargs.get('model') or self.DEFAULT_OLLAMA_MODEL
             base_url = kwargs.get('base_url', 'http://localhost:11434')
+            runtime_options = {
+                key: kwargs[key]
+                for key in ('keep_alive', 'num_ctx', 'num_thread', 'num_gpu')
+                if key in kwargs
+            }
             
-            self.provider = OllamaProvider(model=model, base_url=base_url)
+            self.provider = OllamaProvider(model=model, base_url=base_url, **runtime_options)
         
         else:
             raise ValueError(f"Unsupported provider: {provider}")
+        
+        # Bind once instead of resolving the provider method on every call
+        self._generate = self.provider.generate
+        self._is_available = self.provider.is_available
     
     def generate(
         self,
         prompt: str,
         system_message: Optional[str] = None,
         temperature: float = 0.7,
-        max_tokens: int = 2000
+        max_tokens: int = 2000,
+        stable_prefix: Optional[str] = None,
+        stop_on: Optional[str] = None
     ) -> str:
         """
         Generate text from a prompt.
@@ -234,22 +846,225 @@ class AIClient:
             system_message: Optional system message for context
             temperature: Sampling temperature
             max_tokens: Maximum tokens to generate
+            stable_prefix: Text shared across requests, placed first so provider prefix caching applies
+            stop_on: Stream the response and stop at the first occurrence of this marker
             
         Returns:
             Generated text
         """
+        messages = self._build_messages(prompt, system_message, stable_prefix)
+        
+        # Sampled output is meant to vary, so only temperature 0 is cached exactly
+        use_exact = self.cache is not None and temperature == 0.0
+        use_semantic = (
+            self.semantic_cache is not None
+            and temperature <= self.SEMANTIC_CACHE_MAX_TEMPERATURE
+        )
+        
+        if use_exact:
+            key = ResponseCache.make_key(self.provider.model, messages, temperature, max_tokens, stop_on)
+            cached = self._lookup_l1(key)
+            if cached is not None:
+                return cached
+            cached = self.cache.get(key)
+            if cached is not None:
+                self._remember_l1(key, cached)
+                return cached
+        
+        if use_semantic:
+            scope = SemanticCache.make_scope(self.provider.model, messages, stop_on)
+            text = SemanticCache.prompt_text(messages)
+            cached = self.semantic_cache.get(scope, text)
+            if cached is not None:
+                if use_exact:
+                    self._remember_l1(key, cached)
+                    self.cache.set(key, cached)
+                return cached
+        
+        response = self._generate(messages, temperature, max_tokens, stop_on=stop_on)
+        
+        if use_exact:
+            self._remember_l1(key, response)
+            self.cache.set(key, response)
+        if use_semantic:
+            self.semantic_cache.set(scope, text, response)
+        return response
+    
+    def _lookup_l1(self, key: str) -> Optional[str]:
+        """Return a response from the in-process LRU, marking it most recently used."""
+        with self._l1_lock:
+            cached = self._l1.get(key)
+            if cached is not None:
+                self._l1.move_to_end(key)
+            return cached
+    
+    def _remember_l1(self, key: str, response: str):
+        """Store a response in the in-process LRU, evicting the oldest entry when full."""
+        with self._l1_lock:
+            self._l1[key] = response
+            self._l1.move_to_end(key)
+            if len(self._l1) > self.L1_CACHE_SIZE:
+                self._l1.popitem(last=False)
+    
+    def generate_stream(
+        self,
+        prompt: str,
+        system_message: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: int = 2000,
+        stable_prefix: Optional[str] = None
+    ) -> Iterator[str]:
+        """
+        Yield generated text in chunks as the provider produces them.
+        
+        Lets callers write or display output while it is still being generated.
+        Streamed responses bypass the response caches.
+        
+        Args:
+            prompt: User prompt
+            system_message: Optional system message for context
+            temperature: Sampling temperature
+            max_tokens: Maximum tokens to generate
+            stable_prefix: Text shared across requests, placed first so provider prefix caching applies
+            
+        Returns:
+            Iterator over text chunks
+        """
+        messages = self._build_messages(prompt, system_message, stable_prefix)
+        return self.provider.stream(messages, temperature, max_tokens)
+    
+    def generate_many(
+        self,
+        prompts: List[str],
+        system_message: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: int = 2000,
+        stable_prefix: Optional[str] = None
+    ) -> List[str]:
+        """
+        Generate responses for independent prompts concurrently.
+        
+        Total latency is roughly that of the slowest prompt rather than the sum.
+        Must not be called from inside a running event loop.
+        
+        Args:
+            prompts: User prompts
+            system_message: Optional system message shared by every prompt
+            temperature: Sampling temperature
+            max_tokens: Maximum tokens to generate per prompt
+            stable_prefix: Text shared across requests, placed first so provider prefix caching applies
+            
+        Returns:
+            Generated texts, in the same order as prompts
+        """
+        if len(prompts) > 1:
+            # Load the model once up front rather than in every concurrent request
+            self.warmup()
+        
+        async def run_all():
+            try:
+                return await asyncio.gather(*(
+                    self.provider.agenerate(
+                        self._build_messages(prompt, system_message, stable_prefix), temperature, max_tokens
+                    )
+                    for prompt in prompts
+                ))
+            finally:
+                # The async client is bound to this loop, which asyncio.run closes
+                aclose = getattr(self.provider, "aclose", None)
+                if aclose is not None:
+                    await aclose()
+        
+        return list(asyncio.run(run_all()))
+    
+    def generate_batch(
+        self,
+        prompts: List[str],
+        system_message: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: int = 2000
+    ) -> List[str]:
+        """
+        Answer several independent prompts with a single request.
+        
+        The prompts are sent as one JSON-mode request whose response must be
+        {"results": [...]} with one string per prompt. If the response does not
+        parse into exactly that shape, each prompt is generated separately.
+        
+        Args:
+            prompts: User prompts
+            system_message: Optional system message shared by every prompt
+            temperature: Sampling temperature
+            max_tokens: Maximum tokens to generate per prompt
+            
+        Returns:
+            Generated texts, in the same order as prompts
+        """
+        if len(prompts) <= 1:
+            return [self.generate(prompt, system_message, temperature, max_tokens) for prompt in prompts]
+        
+        batch_prompt = (
+            'Respond in JSON: {"results": [...]} with exactly one string result per input, '
+            "in the same order as the inputs. Inputs:\n" + json.dumps(prompts)
+        )
+        messages = self._build_messages(batch_prompt, system_message)
+        
+        try:
+            response = self._generate(
+                messages, temperature, max_tokens * len(prompts), json_mode=True
+            )
+            results = json.loads(response)["results"]
+            if (
+                isinstance(results, list)
+                and len(results) == len(prompts)
+                and all(isinstance(result, str) for result in results)
+            ):
+                return results
+        except (ValueError, KeyError, TypeError):
+            pass
+        
+        return [self.generate(prompt, system_message, temperature, max_tokens) for prompt in prompts]
+    
+    @staticmethod
+    def _normalize_system_text(text: str) -> str:
+        """Canonical form of system text so identical prompts stay byte-identical."""
+        return textwrap.dedent(text).strip()
+    
+    @classmethod
+    def _build_messages(
+        cls,
+        prompt: str,
+        system_message: Optional[str] = None,
+        stable_prefix: Optional[str] = None
+    ) -> List[Message]:
+        """
+        Build the message list for a single prompt.
+        
+        Providers cache the longest matching prefix of a request, so the stable
+        prefix and system message always come first and per-call text last.
+        """
         messages = []
         
-        if system_message:
-            messages.append(Message("system", system_message))
+        system_parts = [
+            cls._normalize_system_text(part)
+            for part in (stable_prefix, system_message)
+            if part
+        ]
+        if system_parts:
+            messages.append(Message("system", "\n\n".join(system_parts)))
         
         messages.append(Message("user", prompt))
-        
-        return self.provider.generate(messages, temperature, max_tokens)
+        return messages
+    
+    def warmup(self):
+        """Preload the model if the provider supports it (Ollama)."""
+        warmup = getattr(self.provider, "warmup", None)
+        if warmup is not None:
+            warmup()
     
     def is_available(self) -> bool:
         """Check if the configured provider is available."""
-        return self.provider.is_available()
+        return self._is_available()
     
     @classmethod
     def from_config(cls, config):
@@ -280,6 +1095,9 @@ class AIClient:
 
 # Singleton instance
 _ai_client_instance: Optional[AIClient] = None
+_ai_client_lock = threading.Lock()
+_ai_client_async_lock: Optional[asyncio.Lock] = None
+_ai_client_async_loop = None
 
 
 def get_ai_client(config=None) -> AIClient:
@@ -294,9 +1112,37 @@ def get_ai_client(config=None) -> AIClient:
     """
     global _ai_client_instance
     
+    # Double-checked so concurrent first calls build a single client (and pool)
     if _ai_client_instance is None:
-        if config is None:
-            raise RuntimeError("Config required for first AI client initialization")
-        _ai_client_instance = AIClient.from_config(config)
+        with _ai_client_lock:
+            if _ai_client_instance is None:
+                if config is None:
+                    raise RuntimeError("Config required for first AI client initialization")
+                _ai_client_instance = AIClient.from_config(config)
     
     return _ai_client_instance
+
+
+async def aget_ai_client(config=None) -> AIClient:
+    """
+    Async-safe variant of get_ai_client() for coroutines.
+    
+    Args:
+        config: Configuration object (required on first call)
+        
+    Returns:
+        AIClient instance
+    """
+    global _ai_client_async_lock, _ai_client_async_loop
+    
+    if _ai_client_instance is not None:
+        return _ai_client_instance
+    
+    # asyncio.Lock belongs to one event loop, so recreate it for a new loop
+    loop = asyncio.get_running_loop()
+    if _ai_client_async_lock is None or _ai_client_async_loop is not loop:
+        _ai_client_async_lock = asyncio.Lock()
+        _ai_client_async_loop = loop
+    
+    async with _ai_client_async_lock:
+        return get_ai_client(config)
@@ -5,17 +5,232 @@ AI-powered code generation for projects.
 
 from typing import Dict, List, Optional
 from pathlib import Path
+from types import SimpleNamespace
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from enum import IntEnum
+from functools import lru_cache
+import logging
 import os
+import re
 import json
+import queue
+import string
+import threading
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - stdlib fallback
+    orjson = None
 
 from src.planning.project_planner import ProjectBrief
-from src.generation.ai_provider import get_ai_client
+from src.generation.ai_provider import AIClient, Message, SemanticCache, get_ai_client
 from src.database import Project
 
+logger = logging.getLogger(__name__)
+
+
+def _json_loads(text: str):
+    """Parse JSON with orjson when available (its JSONDecodeError subclasses json's)."""
+    if orjson is not None:
+        return orjson.loads(text)
+    return json.loads(text)
+
+
+# Deletes every ASCII character that isn't alphanumeric, space, hyphen or underscore
+_NAME_KEEP = set(string.ascii_letters + string.digits + " -_")
+_NAME_TRANSLATE = str.maketrans({c: None for c in map(chr, range(128)) if c not in _NAME_KEEP})
+
+
+@lru_cache(maxsize=128)
+def _sanitize(name: str) -> str:
+    """Lowercase name, drop special characters and hyphenate spaces."""
+    lowered = name.lower()
+    if lowered.isascii():
+        sanitized = lowered.translate(_NAME_TRANSLATE)
+    else:
+        sanitized = ''.join(c if c.isalnum() or c in ' -_' else '' for c in lowered)
+    return sanitized.replace(' ', '-')
+
+
+# Pinned requirements for technologies we know how to install
+_TECH_MAP = {
+    "fastapi": "fastapi>=0.104.0\nuvicorn[standard]>=0.24.0",
+    "django": "django>=4.2.0",
+    "flask": "flask>=3.0.0",
+    "pytorch": "torch>=2.1.0",
+    "tensorflow": "tensorflow>=2.15.0",
+    "scikit-learn": "scikit-learn>=1.3.0",
+    "pandas": "pandas>=2.1.0",
+    "numpy": "numpy>=1.24.0",
+    "opencv": "opencv-python>=4.8.0",
+    "transformers": "transformers>=4.35.0",
+    "sqlalchemy": "sqlalchemy>=2.0.0",
+}
+
+_GITIGNORE_COMMON = """# IDE
+.vscode/
+.idea/
+*.swp
+*.swo
+*~
+.DS_Store
+
+# Environment
+.env
+.env.local
+"""
+
+_GITIGNORE_PYTHON = """
+# Python
+__pycache__/
+*.py[cod]
+*$py.class
+*.so
+.Python
+venv/
+env/
+*.egg-info/
+.pytest_cache/
+.coverage
+dist/
+build/
+"""
+
+_GITIGNORE_NODE = """
+# Node
+node_modules/
+npm-debug.log
+yarn-error.log
+.npm
+dist/
+build/
+*.tsbuildinfo
+"""
+
+# Fallback project structures used when AI structure generation fails
+_FALLBACK_BASE = {
+    "README.md": "Project documentation",
+    ".gitignore": "Git ignore rules",
+    "Dockerfile": "Container definition",
+    "docker-compose.yml": "Container orchestration"
+}
+
+_FALLBACK_PYTHON = {
+    "requirements.txt": "Python dependencies",
+    "src/__init__.py": "Package initialization",
+    "src/main.py": "Main application entry point",
+    "tests/__init__.py": "Test package initialization",
+    "tests/test_main.py": "Unit tests"
+}
+
+_FALLBACK_NODE = {
+    "package.json": "NPM package configuration",
+    "src/index.js": "Main application entry point",
+    "tests/index.test.js": "Unit tests",
+    ".eslintrc.json": "ESLint configuration"
+}
+
+_FALLBACK_OTHER = {
+    "src/main.py": "Main application",
+    "tests/test_main.py": "Unit tests"
+}
+
+class _Lang(IntEnum):
+    """Canonical primary language, classified once per project."""
+    OTHER = 0
+    PYTHON = 1
+    JS = 2
+    TS = 3
+
+
+@lru_cache(maxsize=32)
+def _classify_lang(language: str) -> _Lang:
+    """Map a free-form primary_language string to a _Lang."""
+    lang = language.strip().lower()
+    if "python" in lang or lang == "py":
+        return _Lang.PYTHON
+    if lang in ("javascript", "js"):
+        return _Lang.JS
+    if lang in ("typescript", "ts"):
+        return _Lang.TS
+    return _Lang.OTHER
+
+
+_GITIGNORE_BY_LANG = {
+    _Lang.PYTHON: _GITIGNORE_COMMON + _GITIGNORE_PYTHON,
+    _Lang.JS: _GITIGNORE_COMMON + _GITIGNORE_NODE,
+    _Lang.TS: _GITIGNORE_COMMON + _GITIGNORE_NODE,
+    _Lang.OTHER: _GITIGNORE_COMMON,
+}
+
+_DOCKERFILE_PYTHON = """# Use an official Python runtime as a parent image
+FROM python:3.11-slim
+
+# Set the working directory in the container
+WORKDIR /app
+
+# Copy the requirements file into the container
+COPY requirements.txt .
+
+# Install any needed packages specified in requirements.txt
+RUN pip install --no-cache-dir -r requirements.txt
+
+# Copy the current directory contents into the container at /app
+COPY . .
+
+# Set environment variables
+ENV APP_ENV=production
+ENV PYTHONUNBUFFERED=1
+
+# Run the application
+CMD ["python", "src/main.py"]
+"""
+
+_DOCKERFILE_NODE = """# Use an official Node.js runtime as a parent image
+FROM node:18-alpine
+
+# Set the working directory
+WORKDIR /app
+
+# Copy package headers
+COPY package*.json ./
+
+# Install dependencies
+RUN npm install --production
+
+# Copy source
+COPY . .
+
+# Expose port
+EXPOSE 8000
+
+# Start app
+CMD ["npm", "start"]
+"""
+
+# Templates that never vary, encoded once for the file writer
+_TEMPLATE_BYTES = {
+    text: text.encode("utf-8")
+    for text in (*_GITIGNORE_BY_LANG.values(), _DOCKERFILE_PYTHON, _DOCKERFILE_NODE)
+}
+
+# Dependency manifests; a generated structure needs at least one
+_MANIFEST_FILES = ("requirements.txt", "package.json", "pom.xml", "Cargo.toml")
+
+_CODE_SUFFIXES = frozenset({".py", ".js", ".ts", ".java", ".cpp"})
+
+# JSON in LLM responses: fenced in a markdown block, or a bare object
+_JSON_FENCE_RE = re.compile(r'```(?:json)?\s*(\{.*?\})\s*```', re.DOTALL)
+_JSON_OBJ_RE = re.compile(r'\{.*\}', re.DOTALL)
+
 
 class CodeGenerator:
     """Generates project code structure and starter files."""
     
+    # Files are generated concurrently; LLM calls are capped separately to respect provider limits
+    MAX_FILE_WORKERS = 8
+    MAX_CONCURRENT_LLM_CALLS = 4
+    
     def __init__(self, config):
         """
         Initialize code generator.
@@ -27,6 +242,62 @@ class CodeGenerator:
         self.ai_client = get_ai_client(config)
         self.output_dir = Path(config.projects.output_directory)
         self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.prompt_cache = self._load_prompt_cache()
+        self._llm_slots = threading.BoundedSemaphore(self.MAX_CONCURRENT_LLM_CALLS)
+    
+    def _load_prompt_cache(self) -> Optional[SemanticCache]:
+        """Open the semantic prompt cache, or None if fastembed isn't installed."""
+        try:
+            return SemanticCache(path=self.output_dir / ".prompt_cache.npz", threshold=0.92)
+        except ImportError:
+            return None
+    
+    def _generate(
+        self,
+        prompt: str,
+        system_message: str,
+        temperature: float,
+        max_tokens: int,
+        exact_scope: Optional[str] = None
+    ) -> str:
+        """
+        Call the AI client, reusing the response of a near-identical earlier prompt.
+        
+        Briefs for similar projects produce almost the same prompts, so a
+        semantic hit skips the LLM round-trip entirely. As in AIClient, only
+        low-temperature calls are matched semantically; exact_scope must match
+        exactly for a hit (e.g. the language a structure is designed for).
+        """
+        use_semantic = (
+            self.prompt_cache is not None
+            and temperature <= AIClient.SEMANTIC_CACHE_MAX_TEMPERATURE
+        )
+        if not use_semantic:
+            with self._llm_slots:
+                return self.ai_client.generate(
+                    prompt=prompt,
+                    system_message=system_message,
+                    temperature=temperature,
+                    max_tokens=max_tokens
+                )
+        
+        scope_messages = [Message("system", system_message)]
+        if exact_scope is not None:
+            scope_messages.append(Message("system", exact_scope))
+        scope = SemanticCache.make_scope(self.ai_client.provider.model, scope_messages)
+        cached = self.prompt_cache.get(scope, prompt)
+        if cached is not None:
+            return cached
+        
+        with self._llm_slots:
+            response = self.ai_client.generate(
+                prompt=prompt,
+                system_message=system_message,
+                temperature=temperature,
+                max_tokens=max_tokens
+            )
+        self.prompt_cache.set(scope, prompt, response)
+        return response
     
     def generate_project(self, project_brief: ProjectBrief, project: Project) -> Path:
         """
@@ -39,55 +310,123 @@ class CodeGenerator:
         Returns:
             Path to generated project directory
         """
+        # Prompt/template fragments shared by every file of this project
+        fragments = self._brief_fragments(project_brief)
+        
         # Create project directory
-        project_dir = self.output_dir / self._sanitize_name(project_brief.title)
+        project_dir = self.output_dir / fragments.sanitized_name
         project_dir.mkdir(parents=True, exist_ok=True)
         
         # Generate file structure
         file_structure = self._determine_file_structure(project_brief)
         
-        # Create directories
-        for file_path in file_structure.keys():
-            file_full_path = project_dir / file_path
-            file_full_path.parent.mkdir(parents=True, exist_ok=True)
+        # Create directories (once per unique parent, shallowest first)
+        parents = {(project_dir / file_path).parent for file_path in file_structure}
+        for parent in sorted(parents, key=lambda path: len(path.parts)):
+            parent.mkdir(parents=True, exist_ok=True)
         
-        # Generate each file
-        generated_files = {}
+        # Collect files to generate
+        tasks = []
         for file_path, file_purpose in file_structure.items():
             # Skip if it looks like a directory (no extension and not a special file)
             # Special files without extension: Dockerfile, LICENSE, Makefile
             is_special = file_path in ["Dockerfile", "LICENSE", "Makefile", "CNAME"]
-            has_extension = "." in os.path.basename(file_path)
+            name = file_path.rpartition("/")[2].rpartition("\\")[2]
+            has_extension = "." in name
             
             if not has_extension and not is_special:
                 # Treat as directory, already created above
                 continue
-                
-            content = self._generate_file_content(
-                file_path=file_path,
-                file_purpose=file_purpose,
-                project_brief=project_brief
-            )
             
-            file_full_path = project_dir / file_path
-            file_full_path.write_text(content, encoding='utf-8')
-            generated_files[file_path] = file_purpose
+            tasks.append((file_path, file_purpose))
+        
+        # Disk writes happen on a background thread, overlapped with LLM calls
+        write_queue = queue.Queue()
+        write_errors = []
+        writer = threading.Thread(
+            target=self._drain_writes, args=(write_queue, write_errors), daemon=True
+        )
+        writer.start()
+        
+        # Generate files concurrently; each is an independent LLM round-trip.
+        # Stats are gathered from the in-memory content as files complete,
+        # so nothing has to be re-read from disk afterwards.
+        generated_files = {}
+        lines_of_code = 0
+        has_readme = False
+        has_tests = False
+        try:
+            with ThreadPoolExecutor(max_workers=self.MAX_FILE_WORKERS) as executor:
+                futures = {
+                    executor.submit(
+                        self._generate_file_content,
+                        file_path=file_path,
+                        file_purpose=file_purpose,
+                        project_brief=project_brief,
+                        fragments=fragments
+                    ): (file_path, file_purpose)
+                    for file_path, file_purpose in tasks
+                }
+                
+                for future in as_completed(futures):
+                    file_path, file_purpose = futures[future]
+                    content = future.result()
+                    
+                    write_queue.put((project_dir / file_path, content))
+                    generated_files[file_path] = file_purpose
+                    
+                    has_readme = has_readme or file_path == "README.md"
+                    has_tests = has_tests or "test" in file_path
+                    if os.path.splitext(file_path)[1] in _CODE_SUFFIXES:
+                        lines_of_code += self._count_lines(content)
+        finally:
+            # All files must be on disk before the project is reported as generated
+            write_queue.put(None)
+            write_queue.join()
+        
+        if write_errors:
+            raise write_errors[0]
         
         # Update project record
         project.file_structure = generated_files
-        project.lines_of_code = self._count_lines(project_dir)
-        project.has_readme = "README.md" in generated_files
-        project.has_tests = any("test" in f for f in generated_files.keys())
+        project.lines_of_code = lines_of_code
+        project.has_readme = has_readme
+        project.has_tests = has_tests
         
         return project_dir
     
+    @staticmethod
+    def _drain_writes(write_queue: queue.Queue, errors: List[Exception]):
+        """Write (path, content) items from the queue until a None sentinel arrives."""
+        while True:
+            item = write_queue.get()
+            try:
+                if item is None:
+                    return
+                file_full_path, content = item
+                # Encode once (static templates are pre-encoded) and write the bytes as-is
+                data = _TEMPLATE_BYTES.get(content)
+                if data is None:
+                    data = content.encode('utf-8')
+                file_full_path.write_bytes(data)
+            except Exception as e:
+                errors.append(e)
+            finally:
+                write_queue.task_done()
+    
+    def _brief_fragments(self, project_brief: ProjectBrief) -> SimpleNamespace:
+        """Derive the strings that prompts and templates build from a brief."""
+        return SimpleNamespace(
+            tech_csv=", ".join(project_brief.technologies),
+            tech_md="\n".join(f"- {tech}" for tech in project_brief.technologies),
+            objectives_md="\n".join(f"- {obj}" for obj in project_brief.learning_objectives),
+            lang=_classify_lang(project_brief.primary_language),
+            sanitized_name=self._sanitize_name(project_brief.title)
+        )
+    
     def _sanitize_name(self, name: str) -> str:
         """Convert project title to valid directory name."""
-        # Remove special characters, replace spaces with hyphens
-        sanitized = name.lower()
-        sanitized = ''.join(c if c.isalnum() or c in ' -_' else '' for c in sanitized)
-        sanitized = sanitized.replace(' ', '-')
-        return sanitized
+        return _sanitize(name)
     
     def _determine_file_structure(self, project_brief: ProjectBrief) -> Dict[str, str]:
         """
@@ -103,33 +442,30 @@ class CodeGenerator:
         try:
             return self._generate_structure_with_ai(project_brief)
         except Exception as e:
-            import logging
-            logging.getLogger(__name__).warning(f"AI Structure generation failed: {e}. Falling back to default.")
+            logger.warning(f"AI Structure generation failed: {e}. Falling back to default.")
             return self._get_fallback_structure(project_brief)
 
     def _extract_json(self, text: str) -> Dict:
         """Extract and parse JSON from text, handling common LLM response formats."""
         try:
             # First try direct parsing
-            return json.loads(text)
+            return _json_loads(text)
         except json.JSONDecodeError:
             pass
-            
-        import re
         
         # Try to find JSON block enclosed in markdown code fences
-        match = re.search(r'```(?:json)?\s*(\{.*?\})\s*```', text, re.DOTALL)
+        match = _JSON_FENCE_RE.search(text)
         if match:
             try:
-                return json.loads(match.group(1))
+                return _json_loads(match.group(1))
             except json.JSONDecodeError:
                 pass
                 
         # Try to find raw JSON object
-        match = re.search(r'\{.*\}', text, re.DOTALL)
+        match = _JSON_OBJ_RE.search(text)
         if match:
             try:
-                return json.loads(match.group(0))
+                return _json_loads(match.group(0))
             except json.JSONDecodeError:
                 pass
                 
@@ -138,8 +474,9 @@ class CodeGenerator:
     def _generate_structure_with_ai(self, project_brief: ProjectBrief) -> Dict[str, str]:
         """Generate file structure using AI with validation."""
         
-        # Factor 1: Initial Generation
-        prompt = f"""Design a complete file structure for a {project_brief.primary_language} project.
+        # Design and validation in a single request (the "2-Factor Analysis"),
+        # so the structure costs one LLM round-trip instead of two
+        prompt = f"""Design and then internally validate a complete file structure for a {project_brief.primary_language} project.
 Title: {project_brief.title}
 Description: {project_brief.description}
 Technologies: {', '.join(project_brief.technologies)}
@@ -151,6 +488,14 @@ Standardize on: README.md, .gitignore, Dockerfile, docker-compose.yml.
 DO NOT include directories as separate entries (e.g., do not include "src", "tests" as keys).
 Only include actual FILES.
 
+Before answering, review your design and ensure critical files are present:
+- requirements.txt / package.json
+- .gitignore
+- Dockerfile & docker-compose.yml
+- README.md
+- Source code entry point
+
+Output only the final, CORRECTED and COMPLETE structure.
 IMPORTANT: Return VALID JSON ONLY. No markdown formatting, no explanations, no text before or after.
 Example:
 {{
@@ -158,93 +503,65 @@ Example:
     "src/main.py": "Entry point"
 }}"""
 
-        response = self.ai_client.generate(
+        response = self._generate(
             prompt=prompt,
-            system_message="You are a senior software architect. Output JSON only.",
+            system_message="You are a senior software architect and QA lead. Output JSON only.",
             temperature=0.3,
-            max_tokens=1000
+            max_tokens=1000,
+            # Similar briefs may share a structure, but only for the same stack
+            exact_scope=json.dumps([
+                project_brief.primary_language,
+                getattr(project_brief, 'app_type', 'script'),
+                sorted(project_brief.technologies)
+            ])
         )
         
         try:
             structure = self._extract_json(response)
         except ValueError:
-            import logging
-            logging.getLogger(__name__).warning("Failed to parse initial AI structure. Using fallback.")
+            logger.warning("Failed to parse AI structure. Using fallback.")
             return self._get_fallback_structure(project_brief)
-
-        # Factor 2: Validation & Enhancement (The "2-Factor Analysis")
-        validation_prompt = f"""Review the following file structure for a {project_brief.primary_language} project:
-{json.dumps(structure, indent=2)}
-
-Project: {project_brief.title}
-Tech: {', '.join(project_brief.technologies)}
-
-Ensure critical files are present:
-- requirements.txt / package.json
-- .gitignore
-- Dockerfile & docker-compose.yml
-- README.md
-- Source code entry point
-
-Return the CORRECTED and COMPLETE JSON structure.
-IMPORTANT: Return VALID JSON ONLY. No markdown formatting, no explanations.
-"""
         
-        validated_response = self.ai_client.generate(
-            prompt=validation_prompt,
-            system_message="You are a QA Lead. Output JSON only.",
-            temperature=0.2,
-            max_tokens=1000
-        )
+        return self._ensure_critical_files(structure, project_brief)
+    
+    def _ensure_critical_files(self, structure: Dict[str, str], project_brief: ProjectBrief) -> Dict[str, str]:
+        """
+        Add any critical files the AI left out, without another LLM call.
         
-        try:
-            return self._extract_json(validated_response)
-        except ValueError:
-            import logging
-            logging.getLogger(__name__).warning("Failed to parse validated AI structure. Using initial structure.")
+        Missing base files and a missing dependency manifest are taken from the
+        fallback structure for the project's language.
+        """
+        has_manifest = any(name in structure for name in _MANIFEST_FILES)
+        if _FALLBACK_BASE.keys() <= structure.keys() and has_manifest:
             return structure
+        
+        fallback = self._get_fallback_structure(project_brief)
+        for file_path, file_purpose in fallback.items():
+            if file_path in _FALLBACK_BASE or (not has_manifest and file_path in _MANIFEST_FILES):
+                structure.setdefault(file_path, file_purpose)
+        return structure
 
     def _get_fallback_structure(self, project_brief: ProjectBrief) -> Dict[str, str]:
         """Fallback to hardcoded structure if AI fails."""
-        lang = project_brief.primary_language.lower()
-        
-        # Base structure
-        structure = {
-            "README.md": "Project documentation",
-            ".gitignore": "Git ignore rules",
-            "Dockerfile": "Container definition",
-            "docker-compose.yml": "Container orchestration"
-        }
+        lang = _classify_lang(project_brief.primary_language)
         
         # Language-specific files
-        if lang in ["python", "py"]:
-            structure.update({
-                "requirements.txt": "Python dependencies",
-                "src/__init__.py": "Package initialization",
-                "src/main.py": "Main application entry point",
-                "tests/__init__.py": "Test package initialization",
-                "tests/test_main.py": "Unit tests"
-            })
-        elif lang in ["javascript", "typescript", "js", "ts"]:
-            structure.update({
-                "package.json": "NPM package configuration",
-                "src/index.js": "Main application entry point",
-                "tests/index.test.js": "Unit tests",
-                ".eslintrc.json": "ESLint configuration"
-            })
+        if lang is _Lang.PYTHON:
+            specific = _FALLBACK_PYTHON
+        elif lang in (_Lang.JS, _Lang.TS):
+            specific = _FALLBACK_NODE
         else:
-            structure.update({
-                "src/main.py": "Main application",
-                "tests/test_main.py": "Unit tests"
-            })
+            specific = _FALLBACK_OTHER
         
-        return structure
+        # Fresh dict: callers may modify the structure they get back
+        return {**_FALLBACK_BASE, **specific}
     
     def _generate_file_content(
         self,
         file_path: str,
         file_purpose: str,
-        project_brief: ProjectBrief
+        project_brief: ProjectBrief,
+        fragments: Optional[SimpleNamespace] = None
     ) -> str:
         """
         Generate content for a specific file.
@@ -253,39 +570,34 @@ IMPORTANT: Return VALID JSON ONLY. No markdown formatting, no explanations.
             file_path: Path to file
             file_purpose: Purpose/description of file
             project_brief: Project specification
+            fragments: Precomputed _brief_fragments() of project_brief
             
         Returns:
             File content as string
         """
+        fragments = fragments or self._brief_fragments(project_brief)
+        
         # Special handling for specific files
-        if file_path == "README.md":
-            return self._generate_readme(project_brief)
-        elif file_path == ".gitignore":
-            return self._generate_gitignore(project_brief.primary_language)
-        elif file_path == "requirements.txt":
-            return self._generate_requirements(project_brief.technologies)
-        elif file_path == "package.json":
-            return self._generate_package_json(project_brief)
-        elif file_path == "Dockerfile":
-            return self._generate_dockerfile(project_brief)
-        elif file_path == "docker-compose.yml":
-            return self._generate_docker_compose(project_brief)
+        handler = _SPECIAL_DISPATCH.get(file_path)
+        if handler is not None:
+            return handler(self, project_brief, fragments)
         elif "__init__.py" in file_path:
             return '"""Package initialization."""\n'
         else:
             # Use AI to generate code files
-            return self._generate_code_with_ai(file_path, file_purpose, project_brief)
+            return self._generate_code_with_ai(file_path, file_purpose, project_brief, fragments)
     
-    def _generate_readme(self, project_brief: ProjectBrief) -> str:
+    def _generate_readme(self, project_brief: ProjectBrief, fragments: Optional[SimpleNamespace] = None) -> str:
         """Generate README.md content using AI."""
+        fragments = fragments or self._brief_fragments(project_brief)
         
         prompt = f"""Generate a professional README.md for this project:
 
 **Title**: {project_brief.title}
 **Description**: {project_brief.description}
-**Technologies**: {', '.join(project_brief.technologies)}
+**Technologies**: {fragments.tech_csv}
 **Learning Objectives**:
-{chr(10).join(f'- {obj}' for obj in project_brief.learning_objectives)}
+{fragments.objectives_md}
 
 The README should include:
 1. Project title and description
@@ -300,7 +612,7 @@ The README should include:
 Make it professional and portfolio-ready. Use markdown formatting."""
         
         try:
-            content = self.ai_client.generate(
+            content = self._generate(
                 prompt=prompt,
                 system_message="You are a technical writer creating professional project documentation.",
                 temperature=0.7,
@@ -309,44 +621,49 @@ Make it professional and portfolio-ready. Use markdown formatting."""
             return content
         except Exception as e:
             # Fallback template
-            return self._generate_readme_fallback(project_brief)
+            return self._generate_readme_fallback(project_brief, fragments)
     
-    def _generate_readme_fallback(self, project_brief: ProjectBrief) -> str:
+    def _generate_readme_fallback(
+        self,
+        project_brief: ProjectBrief,
+        fragments: Optional[SimpleNamespace] = None
+    ) -> str:
         """Generate basic README without AI."""
+        fragments = fragments or self._brief_fragments(project_brief)
         return f"""# {project_brief.title}
 
 {project_brief.description}
 
 ## Technologies Used
 
-{chr(10).join(f'- {tech}' for tech in project_brief.technologies)}
+{fragments.tech_md}
 
 ## Installation
 
 ```bash
 # Clone the repository
 git clone <repository-url>
-cd {self._sanitize_name(project_brief.title)}
+cd {fragments.sanitized_name}
 
 # Install dependencies
-{'pip install -r requirements.txt' if 'python' in project_brief.primary_language.lower() else 'npm install'}
+{'pip install -r requirements.txt' if fragments.lang is _Lang.PYTHON else 'npm install'}
 ```
 
 ## Usage
 
 ```bash
 # Run the application
-{'python src/main.py' if 'python' in project_brief.primary_language.lower() else 'npm start'}
+{'python src/main.py' if fragments.lang is _Lang.PYTHON else 'npm start'}
 ```
 
 ## Learning Objectives
 
-{chr(10).join(f'- {obj}' for obj in project_brief.learning_objectives)}
+{fragments.objectives_md}
 
 ## Project Structure
 
 ```
-{self._sanitize_name(project_brief.title)}/
+{fragments.sanitized_name}/
 ├── README.md
 ├── src/
 │   └── main.{project_brief.primary_language}
@@ -359,83 +676,29 @@ cd {self._sanitize_name(project_brief.title)}
 MIT License
 """
     
-    def _generate_gitignore(self, language: str) -> str:
+    def _generate_gitignore(self, lang: _Lang) -> str:
         """Generate .gitignore based on language."""
-        common = """# IDE
-.vscode/
-.idea/
-*.swp
-*.swo
-*~
-.DS_Store
-
-# Environment
-.env
-.env.local
-"""
-        
-        if "python" in language.lower():
-            return common + """
-# Python
-__pycache__/
-*.py[cod]
-*$py.class
-*.so
-.Python
-venv/
-env/
-*.egg-info/
-.pytest_cache/
-.coverage
-dist/
-build/
-"""
-        elif language.lower() in ["javascript", "typescript"]:
-            return common + """
-# Node
-node_modules/
-npm-debug.log
-yarn-error.log
-.npm
-dist/
-build/
-*.tsbuildinfo
-"""
-        else:
-            return common
+        return _GITIGNORE_BY_LANG[lang]
     
     def _generate_requirements(self, technologies: List[str]) -> str:
         """Generate requirements.txt based on technologies."""
         requirements = []
         
-        tech_map = {
-            "fastapi": "fastapi>=0.104.0\nuvicorn[standard]>=0.24.0",
-            "django": "django>=4.2.0",
-            "flask": "flask>=3.0.0",
-            "pytorch": "torch>=2.1.0",
-            "tensorflow": "tensorflow>=2.15.0",
-            "scikit-learn": "scikit-learn>=1.3.0",
-            "pandas": "pandas>=2.1.0",
-            "numpy": "numpy>=1.24.0",
-            "opencv": "opencv-python>=4.8.0",
-            "transformers": "transformers>=4.35.0",
-            "sqlalchemy": "sqlalchemy>=2.0.0",
-        }
-        
         for tech in technologies:
             tech_lower = tech.lower()
-            if tech_lower in tech_map:
-                requirements.append(tech_map[tech_lower])
+            if tech_lower in _TECH_MAP:
+                requirements.append(_TECH_MAP[tech_lower])
         
         if not requirements:
             requirements.append("# Add your dependencies here")
         
         return "\n".join(requirements) + "\n"
     
-    def _generate_package_json(self, project_brief: ProjectBrief) -> str:
+    def _generate_package_json(self, project_brief: ProjectBrief, fragments: Optional[SimpleNamespace] = None) -> str:
         """Generate package.json for Node.js projects."""
+        fragments = fragments or self._brief_fragments(project_brief)
         package = {
-            "name": self._sanitize_name(project_brief.title),
+            "name": fragments.sanitized_name,
             "version": "1.0.0",
             "description": project_brief.description,
             "main": "src/index.js",
@@ -452,13 +715,16 @@ build/
             }
         }
         
+        if orjson is not None:
+            return orjson.dumps(package, option=orjson.OPT_INDENT_2).decode()
         return json.dumps(package, indent=2)
     
     def _generate_code_with_ai(
         self,
         file_path: str,
         file_purpose: str,
-        project_brief: ProjectBrief
+        project_brief: ProjectBrief,
+        fragments: Optional[SimpleNamespace] = None
     ) -> str:
         """Generate code file content using AI."""
         
@@ -481,7 +747,7 @@ Requirements:
 Generate ONLY the code, no explanations outside of code comments."""
         
         try:
-            content = self.ai_client.generate(
+            content = self._generate(
                 prompt=prompt,
                 system_message="You are an expert software engineer writing production-quality code.",
                 temperature=0.6,
@@ -490,32 +756,32 @@ Generate ONLY the code, no explanations outside of code comments."""
             
             # Clean up response if wrapped in markdown
             if "```" in content:
-                # Extract code from markdown code blocks
+                # Extract code from markdown code blocks with a single slice:
+                # skip the opening fence line (language identifier), stop at the closing ```
                 start = content.find("```")
-                content = content[start:]
-                # Remove first line with language identifier
-                lines = content.split('\n')
-                if lines[0].startswith("```"):
-                    lines = lines[1:]
-                # Remove closing ```
-                if lines and lines[-1].strip() == "```":
-                    lines = lines[:-1]
-                content = '\n'.join(lines)
+                nl = content.find("\n", start)
+                if nl == -1:
+                    content = ""
+                else:
+                    end = content.rfind("```")
+                    content = content[nl + 1:end] if end > nl else content[nl + 1:]
             
             return content
         
         except Exception as e:
             # Fallback to simple template
-            return self._generate_code_fallback(file_path, file_purpose, project_brief)
+            return self._generate_code_fallback(file_path, file_purpose, project_brief, fragments)
     
     def _generate_code_fallback(
         self,
         file_path: str,
         file_purpose: str,
-        project_brief: ProjectBrief
+        project_brief: ProjectBrief,
+        fragments: Optional[SimpleNamespace] = None
     ) -> str:
         """Generate basic code template without AI."""
-        if "python" in project_brief.primary_language.lower():
+        fragments = fragments or self._brief_fragments(project_brief)
+        if fragments.lang is _Lang.PYTHON:
             if "test" in file_path:
                 return self._generate_python_test(project_brief)
             else:
@@ -726,57 +992,18 @@ if __name__ == "__main__":
     main()
 '''
 
-    def _generate_dockerfile(self, project_brief: ProjectBrief) -> str:
+    def _generate_dockerfile(self, project_brief: ProjectBrief, fragments: Optional[SimpleNamespace] = None) -> str:
         """Generate Dockerfile based on project requirements."""
-        if "python" in project_brief.primary_language.lower():
-            return f"""# Use an official Python runtime as a parent image
-FROM python:3.11-slim
-
-# Set the working directory in the container
-WORKDIR /app
-
-# Copy the requirements file into the container
-COPY requirements.txt .
-
-# Install any needed packages specified in requirements.txt
-RUN pip install --no-cache-dir -r requirements.txt
-
-# Copy the current directory contents into the container at /app
-COPY . .
-
-# Set environment variables
-ENV APP_ENV=production
-ENV PYTHONUNBUFFERED=1
-
-# Run the application
-CMD ["python", "src/main.py"]
-"""
+        fragments = fragments or self._brief_fragments(project_brief)
+        if fragments.lang is _Lang.PYTHON:
+            return _DOCKERFILE_PYTHON
         else:
-            return """# Use an official Node.js runtime as a parent image
-FROM node:18-alpine
-
-# Set the working directory
-WORKDIR /app
-
-# Copy package headers
-COPY package*.json ./
-
-# Install dependencies
-RUN npm install --production
-
-# Copy source
-COPY . .
-
-# Expose port
-EXPOSE 8000
-
-# Start app
-CMD ["npm", "start"]
-"""
+            return _DOCKERFILE_NODE
 
-    def _generate_docker_compose(self, project_brief: ProjectBrief) -> str:
+    def _generate_docker_compose(self, project_brief: ProjectBrief, fragments: Optional[SimpleNamespace] = None) -> str:
         """Generate docker-compose.yml."""
-        name = self._sanitize_name(project_brief.title)
+        fragments = fragments or self._brief_fragments(project_brief)
+        name = fragments.sanitized_name
         return f"""version: '3.8'
 
 services:
@@ -792,15 +1019,22 @@ services:
     restart: unless-stopped
 """
     
-    def _count_lines(self, directory: Path) -> int:
-        """Count total lines of code in directory."""
-        total_lines = 0
-        
-        for file_path in directory.rglob("*"):
-            if file_path.is_file() and file_path.suffix in [".py", ".js", ".ts", ".java", ".cpp"]:
-                try:
-                    total_lines += len(file_path.read_text(encoding='utf-8').splitlines())
-                except Exception:
-                    pass
-        
-        return total_lines
+    @staticmethod
+    def _count_lines(content: str) -> int:
+        """Count lines in generated content without splitting it into a list."""
+        lines = content.count("\n")
+        # A final line without a trailing newline still counts
+        if content and not content.endswith("\n"):
+            lines += 1
+        return lines
+
+
+# Files generated from templates (or a dedicated prompt) instead of the generic code prompt
+_SPECIAL_DISPATCH = {
+    "README.md": CodeGenerator._generate_readme,
+    ".gitignore": lambda self, brief, fragments: self._generate_gitignore(fragments.lang),
+    "requirements.txt": lambda self, brief, fragments: self._generate_requirements(brief.technologies),
+    "package.json": CodeGenerator._generate_package_json,
+    "Dockerfile": CodeGenerator._generate_dockerfile,
+    "docker-compose.yml": CodeGenerator._generate_docker_compose,
+}
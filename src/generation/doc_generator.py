@@ -6,24 +6,29 @@ Generates project documentation (README, CONTRIBUTING, LICENSE) and commit messa
 from typing import List, Dict, Optional
 from pathlib import Path
 import datetime
+import hashlib
+import json
 
 from src.planning.project_planner import ProjectBrief
-from src.generation.ai_provider import get_ai_client
+from src.generation.ai_provider import ResponseCache, get_ai_client
 from src.database import Project
 
 
 class DocGenerator:
     """Generates documentation and commit messages for projects."""
     
-    def __init__(self, config):
+    def __init__(self, config, reuse_cached: bool = False):
         """
         Initialize documentation generator.
         
         Args:
             config: System configuration
+            reuse_cached: Reuse commit messages generated earlier for the same
+                brief (dry runs and retries) instead of sampling new ones
         """
         self.config = config
         self.ai_client = get_ai_client(config)
+        self.commit_message_cache = ResponseCache() if reuse_cached else None
     
     def generate_documentation(self, project_dir: Path, project_brief: ProjectBrief):
         """
@@ -133,6 +138,12 @@ All notable changes to this project will be documented in this file.
         Returns:
             List of commit messages
         """
+        if self.commit_message_cache is not None:
+            cache_key = self._commit_messages_key(project_brief, num_commits)
+            cached = self.commit_message_cache.get(cache_key)
+            if cached is not None:
+                return cached.split('\n')
+        
         prompt = f"""Generate {num_commits} semantic commit messages for a new project:
 
 **Project**: {project_brief.title}
@@ -164,12 +175,27 @@ docs: add README and installation guide
             # Ensure we have roughly the right number, fallback/trim if needed
             if not messages:
                 return self._fallback_commit_messages(project_brief)
-            return messages[:num_commits]
+            messages = messages[:num_commits]
+            if self.commit_message_cache is not None:
+                self.commit_message_cache.set(cache_key, '\n'.join(messages))
+            return messages
             
         except Exception as e:
             # Fallback
             return self._fallback_commit_messages(project_brief)
 
+    def _commit_messages_key(self, project_brief: ProjectBrief, num_commits: int) -> str:
+        """Hash the brief fields (and model) that the commit message prompt uses."""
+        signature = {
+            "kind": "commit_messages",
+            "model": self.ai_client.provider.model,
+            "title": project_brief.title,
+            "description": project_brief.description,
+            "technologies": project_brief.technologies,
+            "n": num_commits,
+        }
+        return hashlib.sha256(json.dumps(signature, sort_keys=True).encode()).hexdigest()
+
     def _fallback_commit_messages(self, project_brief: ProjectBrief) -> List[str]:
         """Generate basic commit messages without AI."""
         return [
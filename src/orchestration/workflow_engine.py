@@ -5,14 +5,23 @@ Orchestrates the daily project generation workflow.
 
 from typing import Optional
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+from sqlalchemy import func, select, update
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.orm import Session
 from rich.console import Console
 from rich.progress import Progress, SpinnerColumn, TextColumn
-from datetime import datetime
+from rich.prompt import Confirm
+from datetime import datetime, timezone
+import time
+import traceback
+import git
 
 from src.config_manager import get_config_manager
-from src.database import get_database_manager, Project, ProjectStatus, Skill, DailyActivity
+from src.database import get_database_manager, Project, ProjectStatus, Skill, DailyActivity, Achievement
 from src.planning.project_planner import ProjectPlanner
+from src.generation import ai_provider
+from src.generation.ai_provider import AIClient, AIProvider
 from src.generation.code_generator import CodeGenerator
 from src.generation.doc_generator import DocGenerator
 from src.automation.git_manager import GitManager
@@ -45,8 +54,6 @@ class WorkflowEngine:
         self.session = self.db_manager.get_session()
         
         # Initialize components (after config is loaded)
-        from src.generation.ai_provider import AIClient, AIProvider
-        
         # Initialize AI client globally before other components use it
         if not hasattr(self, '_ai_initialized'):
             provider_type = AIProvider(self.config.ai.provider)
@@ -58,13 +65,13 @@ class WorkflowEngine:
             ai_client = AIClient(provider_type, **kwargs)
             
             # Store in global singleton
-            from src.generation import ai_provider
             ai_provider._ai_client_instance = ai_client
             self._ai_initialized = True
         
         self.project_planner = ProjectPlanner(self.session, self.config)
         self.code_generator = CodeGenerator(self.config)
-        self.doc_generator = DocGenerator(self.config)
+        # Dry runs reuse the commit messages of earlier runs of the same brief
+        self.doc_generator = DocGenerator(self.config, reuse_cached=dry_run)
         self.git_manager = GitManager(self.config)
         self.skill_mapper = SkillMapper(self.session)
     
@@ -75,6 +82,10 @@ class WorkflowEngine:
         Returns:
             Created Project object if successful, None otherwise
         """
+        # Runs LLM/network work that overlaps with the main workflow steps.
+        # Only plain values are handed to it; the session stays on this thread.
+        background = ThreadPoolExecutor(max_workers=1, thread_name_prefix="workflow")
+        publish_future = None
         try:
             with Progress(
                 TextColumn("[progress.description]{task.description}"),
@@ -100,17 +111,20 @@ class WorkflowEngine:
                 if not is_novel:
                     console.print("[yellow]Warning:[/yellow] Similar project exists, but continuing...")
                 
+                # Commit messages only depend on the brief: generate them while the code is written
+                commit_messages_future = background.submit(
+                    self.doc_generator.generate_commit_messages, project_brief
+                )
+                
                 # Step 3: Create project record
                 task3 = progress.add_task("Creating project record in database...", total=None)
                 project = self.project_planner.create_project_record(project_brief)
                 project.status = ProjectStatus.IN_PROGRESS
-                self.session.commit()
                 progress.update(task3, completed=True)
                 
                 # Step 4: Generate code
                 task4 = progress.add_task("Generating project code with AI...", total=None)
                 project_dir = self.code_generator.generate_project(project_brief, project)
-                self.session.commit()
                 progress.update(task4, completed=True)
                 
                 console.print(f"\n[green]Project generated at:[/green] {project_dir}")
@@ -127,7 +141,7 @@ class WorkflowEngine:
                 
                 # Step 6: Generate commit messages
                 task6 = progress.add_task("Generating semantic commit messages...", total=None)
-                commit_messages = self.doc_generator.generate_commit_messages(project_brief)
+                commit_messages = commit_messages_future.result()
                 progress.update(task6, completed=True)
                 
                 # Step 7: Git operations
@@ -138,14 +152,12 @@ class WorkflowEngine:
                 
                 # Create commits locally
                 commits = self.git_manager.create_commits(repo, project_dir, commit_messages, project)
-                for commit in commits:
-                    self.session.add(commit)
-                self.session.commit()
+                # Flushed as batched INSERTs; bulk_save_objects would skip the commit_files children
+                self.session.add_all(commits)
                 
                 # Remote operations (if not dry run)
                 if not self.dry_run:
                     # Ensure unique repository name
-                    import time
                     base_repo_name = project.repository_name or project.title.lower().replace(" ", "-").replace("_", "-")
                     
                     # Prevent duplicate repo name errors in DB
@@ -175,7 +187,6 @@ class WorkflowEngine:
                         perform_push = True
                     else:
                         # Interactive confirmation
-                        from rich.prompt import Confirm
                         console.print(f"\n[bold yellow]Review Mode ({mode}):[/bold yellow] Project generated at {project_dir}")
                         if Confirm.ask("Push this project to GitHub now?"):
                             perform_push = True
@@ -183,12 +194,10 @@ class WorkflowEngine:
                             console.print("[yellow]Push skipped. You can push manually later.[/yellow]")
                     
                     if perform_push:
-                        remote_url = self.git_manager.create_remote_repo(project)
-                        if remote_url:
-                            project.repository_url = remote_url
-                            self.git_manager.push_to_remote(repo, remote_url)
-                            project.is_private = self.config.github.default_visibility == "private"
-                            project.repository_name = remote_url.split('/')[-1].replace('.git', '')
+                        # Network-bound: overlaps with the database steps below
+                        publish_future = background.submit(
+                            self._publish, project_dir, project.title, project.description, bool(project.is_private)
+                        )
                 
                 progress.update(task7, completed=True)
                 
@@ -198,16 +207,29 @@ class WorkflowEngine:
                 progress.update(task8, completed=True)
                 
                 # Step 9: Mark project as completed
+                # One timestamp for completion, today's activity and unlocks, so they agree on the day
+                now = datetime.now(timezone.utc).replace(tzinfo=None)
                 project.status = ProjectStatus.COMPLETED
-                project.completed_at = datetime.utcnow()
+                project.completed_at = now
                 project.code_quality_score = 75.0  # Simulated
-                self.session.commit()
                 
                 # Step 10: Log daily activity
-                self._log_daily_activity(project)
+                self._log_daily_activity(project, now)
                 
                 # Step 11: Check Achievements
-                self._check_achievements(project)
+                # Autoflush is off; the achievement queries must see the skill updates
+                self.session.flush()
+                self._check_achievements(project, now)
+                
+                if publish_future is not None:
+                    remote_url = publish_future.result()
+                    if remote_url:
+                        project.repository_url = remote_url
+                        project.is_private = self.config.github.default_visibility == "private"
+                        project.repository_name = remote_url.split('/')[-1].replace('.git', '')
+                
+                # The whole run, project record included, is one transaction
+                self.session.commit()
                 
                 console.print("[bold green]Workflow completed successfully![/bold green]")
                 console.print(f"\n[bold]Project ID:[/bold] {project.id}")
@@ -229,21 +251,50 @@ class WorkflowEngine:
         except Exception as e:
             console.print(f"\n[red]Workflow failed:[/red] {e}")
             console.print(f"[red]Error details:[/red] {str(e)}")
-            import traceback
             console.print(f"[dim]{traceback.format_exc()}[/dim]")
+            # A publish already under way can't be cancelled; let it finish first
+            self._report_unrecorded_publish(publish_future)
+            self.session.rollback()
             return None
         
         finally:
+            # Only work that never started is left to cancel here
+            background.shutdown(wait=False, cancel_futures=True)
             self.session.close()
     
+    def _publish(self, project_dir: Path, title: str, description: str, private: bool) -> Optional[str]:
+        """Create the GitHub repository and push project_dir to it; returns the remote URL."""
+        remote_url = self.git_manager.create_remote_repo(title, description, private)
+        if remote_url:
+            # A Repo of its own: GitPython objects are not shared across threads
+            self.git_manager.push_to_remote(git.Repo(project_dir), remote_url)
+        return remote_url
+    
+    def _report_unrecorded_publish(self, publish_future):
+        """Wait for a publish that outlived a failed run and log where it went."""
+        if publish_future is None:
+            return
+        try:
+            remote_url = publish_future.result()
+        except Exception:
+            # The publish failed as well (or was the failure): nothing to record
+            return
+        if remote_url:
+            console.print(
+                f"[yellow]Project was already pushed to {remote_url}, but the run was rolled back; "
+                f"the repository is not recorded in the database.[/yellow]"
+            )
+    
     def _update_skills(self, project: Project, project_brief):
         """Update skill proficiencies based on project completion."""
+        # One IN query instead of a lookup per skill name
+        skills = {
+            skill.name: skill
+            for skill in self.session.query(Skill).filter(Skill.name.in_(project_brief.skills)).all()
+        }
+        
         for skill_name in project_brief.skills:
-            skill = (
-                self.session.query(Skill)
-                .filter(Skill.name == skill_name)
-                .first()
-            )
+            skill = skills.get(skill_name)
             
             if skill:
                 self.skill_mapper.update_skill_proficiency(
@@ -251,84 +302,83 @@ class WorkflowEngine:
                     project_brief.difficulty,
                     contribution_weight=1.0
                 )
-        
-        self.session.commit()
     
-    def _check_achievements(self, project: Project):
+    def _check_achievements(self, project: Project, now: datetime):
         """Check and unlock achievements."""
-        from src.database import Achievement
-        
-        # 1. Project Count Achievements
-        project_count = self.session.query(Project).count()
+        # Project count and average skill proficiency in one round trip
+        project_count, avg_proficiency = self.session.execute(
+            select(
+                select(func.count(Project.id)).scalar_subquery(),
+                select(func.avg(Skill.proficiency)).scalar_subquery()
+            )
+        ).one()
+        progress = {
+            'project_count': project_count,
+            'skill_level': avg_proficiency or 0,
+        }
         
+        # Both criteria groups in one query, split by criteria_type below
         achievements = self.session.query(Achievement).filter_by(
-            is_unlocked=False, 
-            criteria_type='project_count'
+            is_unlocked=False
+        ).filter(
+            Achievement.criteria_type.in_(list(progress))
         ).all()
         
-        for ach in achievements:
-            if project_count >= ach.criteria_value:
-                self._unlock_achievement(ach)
+        unlocked = [
+            ach for ach in achievements
+            if progress[ach.criteria_type] >= ach.criteria_value
+        ]
+        if not unlocked:
+            return
         
-        # 2. Skill Level Achievements
-        # Calculate average proficiency
-        avg_proficiency = 0
-        skills = self.session.query(Skill).all()
-        if skills:
-            avg_proficiency = sum(s.proficiency for s in skills) / len(skills)
-            
-        achievements = self.session.query(Achievement).filter_by(
-            is_unlocked=False, 
-            criteria_type='skill_level'
-        ).all()
+        # One UPDATE for all of them; the workflow commit expires the loaded rows
+        self.session.query(Achievement).filter(
+            Achievement.id.in_([ach.id for ach in unlocked])
+        ).update(
+            {'is_unlocked': True, 'unlocked_at': now},
+            synchronize_session=False
+        )
         
-        for ach in achievements:
-            if avg_proficiency >= ach.criteria_value:
-                self._unlock_achievement(ach)
+        for ach in unlocked:
+            self._announce_achievement(ach)
 
-    def _unlock_achievement(self, achievement):
-        """Unlock an achievement and notify."""
-        achievement.is_unlocked = True
-        achievement.unlocked_at = datetime.utcnow()
-        self.session.commit()
-        
+    def _announce_achievement(self, achievement):
+        """Notify that an achievement was unlocked."""
         console.print(f"\n[bold yellow]🏆 Achievement Unlocked: {achievement.name}[/bold yellow]")
         console.print(f"[yellow]{achievement.icon} {achievement.description}[/yellow]\n")
     
-    def _log_daily_activity(self, project: Project):
-        """Log activity for today."""
-        today = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
+    def _log_daily_activity(self, project: Project, now: datetime):
+        """Log activity for the day of now."""
+        today = now.replace(hour=0, minute=0, second=0, microsecond=0)
         
-        # Get or create today's activity record
-        activity = (
-            self.session.query(DailyActivity)
-            .filter(DailyActivity.date == today)
-            .first()
+        # Create or bump today's record in one statement (date is unique)
+        stmt = sqlite_insert(DailyActivity).values(
+            date=today,
+            projects_created=1,
+            projects_completed=1,
+            lines_added=project.lines_of_code,
+            execution_successful=True,
+            technologies_used=list(dict.fromkeys(project.technologies or []))
         )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[DailyActivity.date],
+            set_={
+                'projects_created': DailyActivity.projects_created + 1,
+                'projects_completed': DailyActivity.projects_completed + 1,
+                'lines_added': DailyActivity.lines_added + stmt.excluded.lines_added,
+                'execution_successful': True,
+            }
+        ).returning(DailyActivity.id, DailyActivity.technologies_used)
+        activity_id, technologies_used = self.session.execute(stmt).one()
         
-        if not activity:
-            activity = DailyActivity(
-                date=today,
-                projects_created=0,
-                projects_completed=0,
-                commits_made=0,
-                lines_added=0,
-                skills_practiced=[],
-                technologies_used=[],
-                execution_successful=True
-            )
-            self.session.add(activity)
-        
-        # Update activity
-        activity.projects_created += 1
-        activity.projects_completed += 1
-        activity.lines_added += project.lines_of_code
-        activity.execution_successful = True
-        
-        # Add technologies
+        # Append newly used technologies in order (only rewrite the JSON list when there are any)
         if project.technologies:
-            existing_techs = set(activity.technologies_used or [])
-            existing_techs.update(project.technologies)
-            activity.technologies_used = list(existing_techs)
-        
-        self.session.commit()
+            current = technologies_used or []
+            seen = set(current)
+            added = [tech for tech in dict.fromkeys(project.technologies) if tech not in seen]
+            if added:
+                self.session.execute(
+                    update(DailyActivity)
+                    .where(DailyActivity.id == activity_id)
+                    .values(technologies_used=current + added)
+                )
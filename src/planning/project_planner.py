@@ -360,6 +360,9 @@ Generate ONLY the JSON, no additional text."""
         """
         Create database record for the project.
         
+        The record and its skill links are flushed, not committed; the
+        caller owns the transaction.
+        
         Args:
             project_brief: Project specification
             
@@ -384,7 +387,8 @@ Generate ONLY the JSON, no additional text."""
         )
         
         self.session.add(project)
-        self.session.commit()
+        # Flush for project.id; the caller commits the whole workflow at once
+        self.session.flush()
         
         # Link skills to project
         from src.database import Skill, ProjectSkill
@@ -404,6 +408,6 @@ Generate ONLY the JSON, no additional text."""
                 )
                 self.session.add(project_skill)
         
-        self.session.commit()
+        self.session.flush()
         
         return project
@@ -8,7 +8,7 @@ from typing import Dict, List, Tuple
 from sqlalchemy import func
 from rich.console import Console
 
-from src.database import Project, Skill, Commit, DailyActivity, ProjectStatus, ProjectSkill
+from src.database import Project, Skill, Commit, DailyActivity, ProjectStatus, ProjectSkill, ProjectTechnology
 
 class AnalyticsEngine:
     """Provides data aggregation and analysis for the system."""
@@ -39,23 +39,16 @@ class AnalyticsEngine:
     
     def get_top_technologies(self, limit: int = 10) -> List[Tuple[str, int]]:
         """Get most frequently used technologies."""
-        # This requires parsing technologies from projects
-        # For now, we can aggregate from Project.technologies (JSON)
-        # But SQL query on JSON is specific to DB. 
-        # We'll do it in python for sqlite compatibility.
-        projects = self.session.query(Project).all()
-        tech_counts = {}
-        for p in projects:
-            if p.technologies:
-                import json
-                try:
-                    techs = json.loads(p.technologies) if isinstance(p.technologies, str) else p.technologies
-                    for t in techs:
-                        tech_counts[t] = tech_counts.get(t, 0) + 1
-                except:
-                    pass
-        
-        return sorted(tech_counts.items(), key=lambda x: x[1], reverse=True)[:limit]
+        # Aggregated in SQL from the indexed project_technologies table
+        usage = func.count(ProjectTechnology.id)
+        return [
+            (name, count)
+            for name, count in self.session.query(ProjectTechnology.name, usage)
+            .group_by(ProjectTechnology.name)
+            .order_by(usage.desc())
+            .limit(limit)
+            .all()
+        ]
 
     def calculate_streak(self) -> int:
         """Calculate current activity streak in days."""